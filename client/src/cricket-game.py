@@ -1,8 +1,32 @@
 import tkinter as tk
 from tkinter import messagebox, ttk
-import random
+import json
+import os
+import struct
 import time
 
+from cricket_ai import POLICIES
+from cricket_archive import MatchArchive
+from cricket_engine import MatchEngine, RandomPolicy, other_side
+from cricket_log import BallLog, data_path
+from cricket_metrics import attach as attach_metrics, instrument, start_exporter
+from cricket_odds import default_table
+from cricket_replay import ReplayRecorder
+from cricket_rng import MatchRNG
+from cricket_rosters import default_rosters
+from cricket_server import DEFAULT_HOST, DEFAULT_PORT, MatchClient
+from cricket_stats import CareerStats
+
+# Ball pacing: (overlay visible ms, delay before next ball ms, blocking dialogs)
+PACING = {
+    "normal": (1500, 1600, True),
+    "fast": (400, 450, False),
+    "instant": (0, 0, False),
+}
+
+# Most teams listed at once in a team picker; typing narrows the list
+TEAM_LIST_LIMIT = 200
+
 class CricketGame:
     def __init__(self):
         self.root = tk.Tk()
@@ -11,35 +35,81 @@ class CricketGame:
         self.root.configure(bg="#1e3a8a")
         
         # Game state variables
-        self.game_mode = None  # "computer" or "player"
-        self.teams = {
-            "India": ["Rohit", "Virat", "Dhoni", "Hardik", "Jadeja", "Bumrah", "Shami", "Kuldeep", "Rahul", "Pant", "Iyer"],
-            "Australia": ["Warner", "Smith", "Finch", "Maxwell", "Stoinis", "Starc", "Hazlewood", "Lyon", "Carey", "Labuschagne", "Zampa"],
-            "England": ["Root", "Stokes", "Butler", "Morgan", "Bairstow", "Archer", "Broad", "Anderson", "Woakes", "Rashid", "Moeen"],
-            "Pakistan": ["Babar", "Rizwan", "Fakhar", "Hafeez", "Shadab", "Shaheen", "Hasan", "Wasim", "Haris", "Azam", "Nawaz"]
-        }
+        self.game_mode = None  # "computer", "player", "online", "bots" or "replay"
+        self.pacing_var = tk.StringVar(value="normal")
+        self.opponent_var = tk.StringVar(value="pattern")
+        self.rng = MatchRNG()
+        self.next_seed = None  # seed for the next match started from the menu, if chosen
+        self.resumed = False   # resumed matches drew their earlier balls from another seed
+        self.opponent = RandomPolicy(self.rng)
+        self.teams = default_rosters()
         
         self.player1_team = None
         self.player2_team = None
         self.player1_name = "Player 1"
         self.player2_name = "Player 2"
         
+        # Bot-vs-bot play: the policy in each seat
+        self.seats = {}
+        self.render_balls = True
+        self.saved_pacing = None   # pacing to restore after an unrendered bot run
+        
+        # Networked play
+        self.client = None
+        self.local_side = "player1"
+        
         # Game variables
         self.toss_winner = None
         self.batting_first = None
-        self.current_innings = 1
-        self.current_batsman_index = 0
-        self.player1_score = 0
-        self.player2_score = 0
-        self.player1_wickets = 0
-        self.player2_wickets = 0
-        self.current_player_score = 0
-        self.target = 0
         self.is_batting = True
         
-        # Player scores tracking
-        self.player1_individual_scores = [0] * 11
-        self.player2_individual_scores = [0] * 11
+        # Scoring rules and match state
+        self.engine = MatchEngine()
+        
+        # Ball-by-ball log of every match played
+        self.ball_log = BallLog(data_path("balls.log"))
+        self.engine.listeners.append(self.ball_log)
+        
+        # Keyframed record of the current match for the replay screen
+        self.recorder = ReplayRecorder()
+        self.engine.listeners.append(self.recorder)
+        self.replay = None
+        
+        # Archive of finished matches for the stats queries
+        self.archive = MatchArchive(data_path("matches.arc"))
+        
+        # Career statistics and leaderboards
+        self.stats = CareerStats(data_path("stats.json"))
+        
+        # Timing and counting hooks (no-ops unless metrics are enabled)
+        instrument(self, {
+            "process_batting_result": ("cricket_ball_seconds", None),
+            "update_game_display": ("cricket_redraw_seconds", {"screen": "update_game_display"}),
+            "show_result_effect": ("cricket_result_effect_seconds", None),
+            "setup_main_menu": ("cricket_redraw_seconds", {"screen": "main_menu"}),
+            "setup_team_selection": ("cricket_redraw_seconds", {"screen": "team_selection"}),
+            "setup_toss": ("cricket_redraw_seconds", {"screen": "toss"}),
+            "setup_batting_choice": ("cricket_redraw_seconds", {"screen": "batting_choice"}),
+            "setup_game_interface": ("cricket_redraw_seconds", {"screen": "game_interface"}),
+            "refresh_game_interface": ("cricket_redraw_seconds", {"screen": "refresh"}),
+            "show_game_result": ("cricket_redraw_seconds", {"screen": "game_result"}),
+            "setup_leaderboard": ("cricket_redraw_seconds", {"screen": "leaderboard"}),
+        })
+        attach_metrics(self.engine)
+        start_exporter()
+        
+        # Shared result overlay, created on first use
+        self.overlay = None
+        
+        # Pending after() handles by purpose; at most one of each is queued
+        self.after_ids = {}
+        # Set from a human's click until that ball has been shown
+        self.ball_pending = False
+        self.action_state = tk.NORMAL
+        
+        # An unfinished match is saved here when the window is closed
+        self.save_path = data_path("saved_match.json")
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
         
         self.setup_main_menu()
         
@@ -71,13 +141,165 @@ class CricketGame:
                               width=15, height=2)
         player_btn.pack(pady=10)
         
+        online_btn = tk.Button(mode_frame, text="Online Match", 
+                              font=("Arial", 14), bg="#8b5cf6", fg="white",
+                              command=self.setup_online_lobby,
+                              width=15, height=2)
+        online_btn.pack(pady=10)
+        
+        if os.path.exists(self.save_path):
+            resume_btn = tk.Button(mode_frame, text="Resume Match", 
+                                  font=("Arial", 14), bg="#f59e0b", fg="white",
+                                  command=self.resume_match,
+                                  width=15, height=2)
+            resume_btn.pack(pady=10)
+        
+        tk.Button(self.root, text="Leaderboard", 
+                 font=("Arial", 12), bg="#f59e0b", fg="white",
+                 command=self.setup_leaderboard, width=12).pack(pady=5)
+        
+        # Ball pacing selection
+        pacing_frame = tk.Frame(self.root, bg="#1e3a8a")
+        pacing_frame.pack(pady=10)
+        
+        tk.Label(pacing_frame, text="Pacing:", 
+                font=("Arial", 12), fg="white", bg="#1e3a8a").pack(side=tk.LEFT, padx=5)
+        for pacing in PACING:
+            tk.Radiobutton(pacing_frame, text=pacing.title(), variable=self.pacing_var, value=pacing,
+                          font=("Arial", 12), fg="white", bg="#1e3a8a",
+                          selectcolor="#3b82f6").pack(side=tk.LEFT)
+        
+        # Computer opponent selection
+        opponent_frame = tk.Frame(self.root, bg="#1e3a8a")
+        opponent_frame.pack(pady=10)
+        
+        tk.Label(opponent_frame, text="Computer:", 
+                font=("Arial", 12), fg="white", bg="#1e3a8a").pack(side=tk.LEFT, padx=5)
+        for name, label in (("random", "Random"), ("pattern", "Adaptive"), ("equilibrium", "Expert")):
+            tk.Radiobutton(opponent_frame, text=label, variable=self.opponent_var, value=name,
+                          font=("Arial", 12), fg="white", bg="#1e3a8a",
+                          selectcolor="#3b82f6").pack(side=tk.LEFT)
+        
     def set_game_mode(self, mode):
         """Set the game mode and proceed to team selection"""
         self.game_mode = mode
+        # Every match gets its own seeded random stream so it can be replayed
+        self.rng = MatchRNG(self.next_seed)
+        self.next_seed = None
+        self.resumed = False
         if mode == "computer":
             self.player2_name = "Computer"
+            self.opponent = POLICIES[self.opponent_var.get()](rng=self.rng)
+        else:
+            self.opponent = RandomPolicy(self.rng)
         self.setup_team_selection()
         
+    def setup_online_lobby(self):
+        """Setup the screen for joining a match on a cricket_server"""
+        self.clear_screen()
+        
+        # Title
+        tk.Label(self.root, text="Online Match", 
+                font=("Arial", 20, "bold"), fg="white", bg="#1e3a8a").pack(pady=30)
+        
+        form_frame = tk.Frame(self.root, bg="#1e3a8a")
+        form_frame.pack(pady=10)
+        
+        self.server_var = tk.StringVar(value=f"{DEFAULT_HOST}:{DEFAULT_PORT}")
+        self.online_name_var = tk.StringVar(value=self.player1_name)
+        self.online_room_var = tk.StringVar()
+        self.online_team_var = tk.StringVar(value=self.teams.names[0])
+        
+        for row, (label, var) in enumerate([("Server:", self.server_var),
+                                            ("Your name:", self.online_name_var),
+                                            ("Room (optional):", self.online_room_var)]):
+            tk.Label(form_frame, text=label, font=("Arial", 12), 
+                    fg="white", bg="#1e3a8a").grid(row=row, column=0, sticky=tk.W, pady=5)
+            tk.Entry(form_frame, textvariable=var, font=("Arial", 12), 
+                    width=20).grid(row=row, column=1, pady=5)
+        
+        tk.Label(form_frame, text="Your team:", font=("Arial", 12), 
+                fg="white", bg="#1e3a8a").grid(row=3, column=0, sticky=tk.NW, pady=5)
+        team_frame = tk.Frame(form_frame, bg="#1e3a8a")
+        team_frame.grid(row=3, column=1, pady=5)
+        self.create_team_picker(team_frame, self.online_team_var, height=5)
+        
+        self.online_status_var = tk.StringVar()
+        tk.Label(self.root, textvariable=self.online_status_var, font=("Arial", 12), 
+                fg="yellow", bg="#1e3a8a").pack(pady=10)
+        
+        tk.Button(self.root, text="Connect", 
+                 font=("Arial", 14), bg="#22c55e", fg="white",
+                 command=self.connect_online, width=15, height=2).pack(pady=10)
+        
+        tk.Button(self.root, text="Back", 
+                 font=("Arial", 12), bg="#ef4444", fg="white",
+                 command=self.restart_game, width=10).pack(pady=10)
+        
+    def connect_online(self):
+        """Connect to the match server and wait for an opponent"""
+        if self.client is not None:
+            return
+        host, _, port = self.server_var.get().strip().rpartition(":")
+        try:
+            port = int(port or DEFAULT_PORT)
+        except ValueError:
+            messagebox.showerror("Error", f"Invalid server port {port!r}")
+            return
+        
+        # Connects in the background; join once the "connected" message arrives
+        self.client = MatchClient(host or DEFAULT_HOST, port)
+        self.game_mode = "online"
+        self.online_status_var.set("Connecting...")
+        self.poll_network()
+        
+    def poll_network(self):
+        """Handle messages from the match server"""
+        if self.client is None:
+            return
+        for message in self.client.poll():
+            self.handle_network_message(message)
+            if self.client is None:
+                return
+        self.schedule("network", 50, self.poll_network)
+        
+    def handle_network_message(self, message):
+        """React to one message from the match server"""
+        kind = message["type"]
+        if kind == "connected":
+            self.client.join(self.online_name_var.get() or "Player", self.online_team_var.get(),
+                             self.online_room_var.get() or None)
+        elif kind == "connect_failed":
+            self.disconnect_online()
+            self.game_mode = None
+            self.online_status_var.set("")
+            messagebox.showerror("Error", f"Could not connect to server:\n{message['message']}")
+        elif kind == "waiting":
+            self.online_status_var.set("Waiting for an opponent...")
+        elif kind == "start":
+            self.local_side = message["side"]
+            self.player1_name = message["player1_name"]
+            self.player2_name = message["player2_name"]
+            self.player1_team = message["player1_team"]
+            self.player2_team = message["player2_team"]
+            self.batting_first = message["batting_first"]
+            self.engine.start(self.batting_first, match_id=time.time_ns())
+            self.setup_game_interface()
+        elif kind == "ball":
+            # Both numbers are known; score the ball exactly as in local play
+            self.process_batting_result(message["bat"], message["bowl"])
+        elif kind == "error":
+            messagebox.showerror("Server Error", message["message"])
+        elif kind in ("opponent_left", "disconnected") and not self.engine.finished:
+            messagebox.showerror("Match Abandoned", "The connection to your opponent was lost.")
+            self.restart_game()
+        
+    def disconnect_online(self):
+        """Close the connection to the match server"""
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+        
     def setup_team_selection(self):
         """Setup team selection interface"""
         self.clear_screen()
@@ -99,10 +321,7 @@ class CricketGame:
                 font=("Arial", 14), fg="white", bg="#1e3a8a").pack(pady=10)
         
         self.p1_team_var = tk.StringVar()
-        for team in self.teams.keys():
-            tk.Radiobutton(p1_frame, text=team, variable=self.p1_team_var, value=team,
-                          font=("Arial", 12), fg="white", bg="#1e3a8a",
-                          selectcolor="#3b82f6").pack(anchor=tk.W)
+        self.create_team_picker(p1_frame, self.p1_team_var)
         
         # Player 2 team selection
         p2_frame = tk.Frame(selection_frame, bg="#1e3a8a")
@@ -112,10 +331,7 @@ class CricketGame:
                 font=("Arial", 14), fg="white", bg="#1e3a8a").pack(pady=10)
         
         self.p2_team_var = tk.StringVar()
-        for team in self.teams.keys():
-            tk.Radiobutton(p2_frame, text=team, variable=self.p2_team_var, value=team,
-                          font=("Arial", 12), fg="white", bg="#1e3a8a",
-                          selectcolor="#3b82f6").pack(anchor=tk.W)
+        self.create_team_picker(p2_frame, self.p2_team_var)
         
         # Continue button
         continue_btn = tk.Button(self.root, text="Continue to Toss", 
@@ -123,6 +339,40 @@ class CricketGame:
                                 command=self.validate_teams, width=20, height=2)
         continue_btn.pack(pady=30)
         
+    def create_team_picker(self, parent, team_var, height=8):
+        """Search box over a list of matching teams; the chosen team goes in team_var"""
+        search_var = tk.StringVar()
+        tk.Entry(parent, textvariable=search_var, font=("Arial", 12), width=22).pack(pady=(0, 5))
+        
+        list_frame = tk.Frame(parent, bg="#1e3a8a")
+        list_frame.pack()
+        scrollbar = tk.Scrollbar(list_frame, orient=tk.VERTICAL)
+        listbox = tk.Listbox(list_frame, height=height, width=22, font=("Arial", 12),
+                             exportselection=False, yscrollcommand=scrollbar.set)
+        scrollbar.config(command=listbox.yview)
+        listbox.pack(side=tk.LEFT)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        # A Listbox only draws its visible rows, and at most TEAM_LIST_LIMIT are loaded
+        def fill(*args):
+            matches = self.teams.search(search_var.get(), TEAM_LIST_LIMIT)
+            listbox.delete(0, tk.END)
+            listbox.insert(tk.END, *matches)
+            if team_var.get() in matches:
+                listbox.selection_set(matches.index(team_var.get()))
+            elif len(matches) == 1:
+                team_var.set(matches[0])
+                listbox.selection_set(0)
+        
+        def select(event):
+            selection = listbox.curselection()
+            if selection:
+                team_var.set(listbox.get(selection[0]))
+        
+        search_var.trace_add("write", fill)
+        listbox.bind("<<ListboxSelect>>", select)
+        fill()
+        
     def validate_teams(self):
         """Validate team selection and proceed to toss"""
         self.player1_team = self.p1_team_var.get()
@@ -175,7 +425,7 @@ class CricketGame:
         
     def perform_toss(self, call):
         """Perform the toss and determine winner"""
-        coin_result = random.choice(["heads", "tails"])
+        coin_result = self.rng.coin()
         
         if call == coin_result:
             self.toss_winner = "player1"
@@ -185,11 +435,15 @@ class CricketGame:
             winner_text = f"{self.player2_name} wins the toss!"
         
         # Show toss result
-        messagebox.showinfo("Toss Result", f"Coin shows: {coin_result.upper()}\n{winner_text}")
+        self.notify("Toss Result", f"Coin shows: {coin_result.upper()}\n{winner_text}")
         self.setup_batting_choice()
         
     def setup_batting_choice(self):
         """Setup batting choice for toss winner"""
+        if self.game_mode == "bots":
+            self.set_batting_order(self.rng.choice(("bat", "bowl")))
+            return
+        
         self.clear_screen()
         
         winner_name = self.player1_name if self.toss_winner == "player1" else self.player2_name
@@ -225,157 +479,220 @@ class CricketGame:
         if choice == "bat":
             self.batting_first = self.toss_winner
         else:
-            self.batting_first = "player2" if self.toss_winner == "player1" else "player1"
+            self.batting_first = other_side(self.toss_winner)
         
-        self.setup_game_interface()
+        self.engine.start(self.batting_first, match_id=time.time_ns())
+        if self.render_balls:
+            self.setup_game_interface()
         
     def setup_game_interface(self):
-        """Setup the main game interface"""
+        """Build the main game interface once per match"""
         self.clear_screen()
         
-        # Determine current batting team
-        if self.current_innings == 1:
-            current_batting = self.batting_first
-        else:
-            current_batting = "player2" if self.batting_first == "player1" else "player1"
-        
         # Score display frame
         score_frame = tk.Frame(self.root, bg="#1e3a8a")
         score_frame.pack(pady=10, fill=tk.X)
         
         # Team scores
-        p1_score_text = f"{self.player1_team}: {self.player1_score}/{self.player1_wickets}"
-        p2_score_text = f"{self.player2_team}: {self.player2_score}/{self.player2_wickets}"
+        self.p1_score_var = tk.StringVar()
+        self.p2_score_var = tk.StringVar()
         
-        tk.Label(score_frame, text=p1_score_text, font=("Arial", 14, "bold"), 
+        tk.Label(score_frame, textvariable=self.p1_score_var, font=("Arial", 14, "bold"), 
                 fg="white", bg="#1e3a8a").pack(side=tk.LEFT, padx=20)
         
-        tk.Label(score_frame, text=p2_score_text, font=("Arial", 14, "bold"), 
+        tk.Label(score_frame, textvariable=self.p2_score_var, font=("Arial", 14, "bold"), 
                 fg="white", bg="#1e3a8a").pack(side=tk.RIGHT, padx=20)
         
         # Current innings info
-        innings_text = f"Innings {self.current_innings}"
-        if self.current_innings == 2:
-            innings_text += f" - Target: {self.target + 1}"
-        
-        tk.Label(self.root, text=innings_text, font=("Arial", 12), 
+        self.innings_var = tk.StringVar()
+        tk.Label(self.root, textvariable=self.innings_var, font=("Arial", 12), 
                 fg="yellow", bg="#1e3a8a").pack(pady=5)
         
-        # Current batsman info
-        if current_batting == "player1":
-            current_team = self.teams[self.player1_team]
-            batsman_name = current_team[self.current_batsman_index]
-            current_score = self.player1_individual_scores[self.current_batsman_index]
-        else:
-            current_team = self.teams[self.player2_team]
-            batsman_name = current_team[self.current_batsman_index]
-            current_score = self.player2_individual_scores[self.current_batsman_index]
+        # Win probability meter
+        self.meter_var = tk.StringVar()
+        tk.Label(self.root, textvariable=self.meter_var, font=("Arial", 11), 
+                fg="white", bg="#1e3a8a").pack(pady=5)
         
-        batsman_info = f"Current Batsman: {batsman_name} - {current_score} runs"
-        self.batsman_label = tk.Label(self.root, text=batsman_info, font=("Arial", 14, "bold"), 
+        # Current batsman info
+        self.batsman_var = tk.StringVar()
+        self.batsman_label = tk.Label(self.root, textvariable=self.batsman_var, font=("Arial", 14, "bold"), 
                                      fg="lime", bg="#1e3a8a")
         self.batsman_label.pack(pady=10)
         
+        # Game action area
+        self.action_frame = tk.Frame(self.root, bg="#1e3a8a")
+        self.action_frame.pack(pady=20)
+        
+        self.action_prompt = tk.Label(self.action_frame, font=("Arial", 14), 
+                                      fg="white", bg="#1e3a8a")
+        self.action_prompt.pack(pady=10)
+        
+        buttons_frame = tk.Frame(self.action_frame, bg="#1e3a8a")
+        buttons_frame.pack(pady=10)
+        
+        self.action_buttons = []
+        for i in range(1, 7):
+            btn = tk.Button(buttons_frame, text=str(i), font=("Arial", 16, "bold"),
+                           width=3, height=2, fg="white")
+            btn.pack(side=tk.LEFT, padx=5)
+            self.action_buttons.append(btn)
+        self.action_role = None
+        self.action_state = tk.NORMAL
+        
+        self.refresh_game_interface()
+        
+    def refresh_game_interface(self):
+        """Update only the scoreboard text and buttons that changed since the last ball"""
+        if not self.render_balls:
+            return
+        engine = self.engine
+        
+        # Determine current batting team
+        current_batting = engine.current_batting
+        
+        # Team scores
+        self.set_text(self.p1_score_var, f"{self.player1_team}: {engine.player1_score}/{engine.player1_wickets}")
+        self.set_text(self.p2_score_var, f"{self.player2_team}: {engine.player2_score}/{engine.player2_wickets}")
+        
+        # Current innings info
+        innings_text = f"Innings {engine.current_innings}"
+        if engine.current_innings == 2:
+            innings_text += f" - Target: {engine.target + 1}"
+        self.set_text(self.innings_var, innings_text)
+        
+        # Win probability meter
+        p1_win, p2_win, tie = default_table().for_engine(engine)
+        self.set_text(self.meter_var, f"Win probability: {self.player1_team} {p1_win:.0%} | "
+                                      f"Tie {tie:.0%} | {self.player2_team} {p2_win:.0%}")
+        
+        # Current batsman info
+        current_team = self.player1_team if current_batting == "player1" else self.player2_team
+        batsman_name = self.teams.player(current_team, engine.current_batsman_index)
+        current_score = engine.current_batsman_score()
+        self.set_text(self.batsman_var, f"Current Batsman: {batsman_name} - {current_score} runs")
+        
         # Game action area
         self.setup_game_actions(current_batting)
         
+    def set_text(self, var, text):
+        """Set a StringVar only when its text actually changes"""
+        if var.get() != text:
+            var.set(text)
+        
     def setup_game_actions(self, batting_team):
-        """Setup game action buttons based on current situation"""
-        # Clear previous action frame if exists
-        if hasattr(self, 'action_frame'):
-            self.action_frame.destroy()
+        """Point the action buttons at batting or bowling when the role changes"""
+        # Replays only show the numbers played
+        if self.game_mode == "replay":
+            return
         
-        self.action_frame = tk.Frame(self.root, bg="#1e3a8a")
-        self.action_frame.pack(pady=20)
+        # Bots play the next ball once this one has been shown
+        if self.game_mode == "bots":
+            self.set_action_state(tk.DISABLED)
+            self.schedule("bot", None, self.play_bot_ball)
+            return
+        
+        # The last ball has been shown, so accept the next one
+        self.set_action_state(tk.NORMAL)
         
         # Determine if human player is batting
-        if (batting_team == "player1") or (batting_team == "player2" and self.game_mode == "player"):
-            self.setup_batting_interface()
+        if self.game_mode == "online":
+            role = "batting" if batting_team == self.local_side else "bowling"
+        elif (batting_team == "player1") or (batting_team == "player2" and self.game_mode == "player"):
+            role = "batting"
         else:
             # Computer is batting
+            role = "bowling"
+        
+        if role == self.action_role:
+            return
+        self.action_role = role
+        if role == "batting":
+            self.setup_batting_interface()
+        else:
             self.setup_bowling_interface()
         
+    def set_action_state(self, state):
+        """Enable or disable all six action buttons"""
+        if state == self.action_state:
+            return
+        self.action_state = state
+        for btn in self.action_buttons:
+            btn.config(state=state)
+        
+    def accept_ball(self):
+        """Claim the single pending-ball slot; False while a ball is still in play"""
+        if self.ball_pending or self.engine.finished:
+            return False
+        self.ball_pending = True
+        self.set_action_state(tk.DISABLED)
+        return True
+        
+    def send_move(self, number):
+        """Submit our number to the match server and wait for the opponent"""
+        self.client.move(number)
+        
     def setup_batting_interface(self):
         """Setup interface when human player is batting"""
-        tk.Label(self.action_frame, text="Select your shot (1-6):", 
-                font=("Arial", 14), fg="white", bg="#1e3a8a").pack(pady=10)
+        self.action_prompt.config(text="Select your shot (1-6):")
         
         # Batting buttons
-        buttons_frame = tk.Frame(self.action_frame, bg="#1e3a8a")
-        buttons_frame.pack(pady=10)
-        
-        for i in range(1, 7):
-            btn = tk.Button(buttons_frame, text=str(i), font=("Arial", 16, "bold"),
-                           width=3, height=2, bg="#3b82f6", fg="white",
-                           command=lambda run=i: self.player_bats(run))
-            btn.pack(side=tk.LEFT, padx=5)
+        for i, btn in enumerate(self.action_buttons, start=1):
+            btn.config(bg="#3b82f6", command=lambda run=i: self.player_bats(run))
     
     def setup_bowling_interface(self):
         """Setup interface when human player is bowling"""
-        tk.Label(self.action_frame, text="Select your bowl (1-6):", 
-                font=("Arial", 14), fg="white", bg="#1e3a8a").pack(pady=10)
+        self.action_prompt.config(text="Select your bowl (1-6):")
         
         # Bowling buttons
-        buttons_frame = tk.Frame(self.action_frame, bg="#1e3a8a")
-        buttons_frame.pack(pady=10)
-        
-        for i in range(1, 7):
-            btn = tk.Button(buttons_frame, text=str(i), font=("Arial", 16, "bold"),
-                           width=3, height=2, bg="#ef4444", fg="white",
-                           command=lambda bowl=i: self.player_bowls(bowl))
-            btn.pack(side=tk.LEFT, padx=5)
+        for i, btn in enumerate(self.action_buttons, start=1):
+            btn.config(bg="#ef4444", command=lambda bowl=i: self.player_bowls(bowl))
     
     def player_bats(self, run):
         """Handle when player bats"""
+        if not self.accept_ball():
+            return
+        if self.game_mode == "online":
+            self.send_move(run)
+            return
+        
         # Generate opponent's bowling number
-        if self.game_mode == "computer":
-            bowl_number = random.randint(1, 6)
-        else:
-            # In player vs player, generate random for opponent
-            bowl_number = random.randint(1, 6)
+        # (in player vs player the opponent bowls at random)
+        bowl_number = self.opponent.choose(self.engine, False)
         
         self.process_batting_result(run, bowl_number)
     
     def player_bowls(self, bowl):
         """Handle when player bowls (computer is batting)"""
+        if not self.accept_ball():
+            return
+        if self.game_mode == "online":
+            self.send_move(bowl)
+            return
+        
         # Computer selects batting number
-        bat_number = random.randint(1, 6)
+        bat_number = self.opponent.choose(self.engine, True)
         self.process_batting_result(bat_number, bowl)
     
     def process_batting_result(self, bat_number, bowl_number):
         """Process the result of batting vs bowling"""
-        # Determine current batting team
-        if self.current_innings == 1:
-            current_batting = self.batting_first
+        result = self.engine.play_ball(bat_number, bowl_number)
+        if self.game_mode == "bots":
+            for policy in self.seats.values():
+                policy.observe(result)
         else:
-            current_batting = "player2" if self.batting_first == "player1" else "player1"
+            self.opponent.observe(result)
         
         result_text = f"Bat: {bat_number}, Bowl: {bowl_number}\n"
         
-        if bat_number == bowl_number:
+        if result.out:
             # OUT!
             result_text += "OUT!"
             self.show_result_effect(result_text, "#ef4444")  # Red for out
             
-            if current_batting == "player1":
-                self.player1_wickets += 1
-            else:
-                self.player2_wickets += 1
-            
-            self.current_batsman_index += 1
-            self.current_player_score = 0
-            
         else:
             # Runs scored
             result_text += f"+{bat_number} runs"
             
-            if current_batting == "player1":
-                self.player1_score += bat_number
-                self.player1_individual_scores[self.current_batsman_index] += bat_number
-            else:
-                self.player2_score += bat_number
-                self.player2_individual_scores[self.current_batsman_index] += bat_number
-            
             # Show effect based on runs
             if bat_number == 4:
                 self.show_result_effect(result_text, "#84cc16")  # Green-yellow for 4
@@ -389,77 +706,69 @@ class CricketGame:
     
     def show_result_effect(self, text, color):
         """Show result with color effect"""
-        # Create overlay for effect
-        overlay = tk.Toplevel(self.root)
-        overlay.geometry("300x150")
-        overlay.configure(bg=color)
-        overlay.overrideredirect(True)
+        overlay_ms, next_ball_ms, _ = PACING[self.pacing_var.get()]
+        if overlay_ms:
+            self.show_overlay(text, color, overlay_ms)
+        
+        # One redraw per ball, however the ball got here
+        if next_ball_ms:
+            self.schedule("redraw", next_ball_ms, self.update_game_display)
+        else:
+            self.cancel_scheduled("redraw")
+            self.update_game_display()
+    
+    def show_overlay(self, text, color, duration_ms):
+        """Show the shared result overlay for duration_ms"""
+        # The overlay window is created once and reused for every ball
+        if self.overlay is None or not self.overlay.winfo_exists():
+            self.overlay = tk.Toplevel(self.root)
+            self.overlay.overrideredirect(True)
+            self.overlay_label = tk.Label(self.overlay, font=("Arial", 16, "bold"), fg="white")
+            self.overlay_label.pack(expand=True, fill=tk.BOTH)
         
         # Center the overlay
         x = self.root.winfo_x() + self.root.winfo_width()//2 - 150
         y = self.root.winfo_y() + self.root.winfo_height()//2 - 75
-        overlay.geometry(f"300x150+{x}+{y}")
-        
-        # Result text
-        tk.Label(overlay, text=text, font=("Arial", 16, "bold"), 
-                fg="white", bg=color).pack(expand=True)
-        
-        # Auto-close after 1.5 seconds
-        self.root.after(1500, overlay.destroy)
-        self.root.after(1600, self.update_game_display)
+        self.overlay.geometry(f"300x150+{x}+{y}")
+        self.overlay.configure(bg=color)
+        self.overlay_label.config(text=text, bg=color)
+        self.overlay.deiconify()
+        self.overlay.lift()
+        
+        # A newer result keeps the overlay up for its own full duration
+        self.schedule("overlay", duration_ms, self.hide_overlay)
+    
+    def hide_overlay(self):
+        """Hide the shared result overlay"""
+        if self.overlay is not None and self.overlay.winfo_exists():
+            self.overlay.withdraw()
+    
+    def notify(self, title, message):
+        """Tell the players something, as the current pacing allows"""
+        overlay_ms, _, blocking = PACING[self.pacing_var.get()]
+        if blocking and self.game_mode != "bots":
+            messagebox.showinfo(title, message)
+        elif overlay_ms:
+            self.show_overlay(f"{title}\n{message}", "#1e3a8a", overlay_ms * 2)
     
     def update_game_display(self):
         """Update the game display after each ball"""
+        self.ball_pending = False
+        
         # Check if innings should end
-        if self.should_end_innings():
+        if self.engine.should_end_innings():
             self.end_innings()
         else:
-            self.setup_game_interface()
-    
-    def should_end_innings(self):
-        """Check if current innings should end"""
-        if self.current_innings == 1:
-            current_batting = self.batting_first
-        else:
-            current_batting = "player2" if self.batting_first == "player1" else "player1"
-        
-        # Check wickets
-        if current_batting == "player1":
-            if self.player1_wickets >= 10:
-                return True
-        else:
-            if self.player2_wickets >= 10:
-                return True
-        
-        # Check if target is chased in second innings
-        if self.current_innings == 2:
-            if current_batting == "player1":
-                if self.player1_score > self.target:
-                    return True
-            else:
-                if self.player2_score > self.target:
-                    return True
-        
-        return False
+            self.refresh_game_interface()
     
     def end_innings(self):
         """End current innings and proceed"""
-        if self.current_innings == 1:
-            # Set target for second innings
-            if self.batting_first == "player1":
-                self.target = self.player1_score
-            else:
-                self.target = self.player2_score
-            
-            self.current_innings = 2
-            self.current_batsman_index = 0
-            self.current_player_score = 0
-            
+        if not self.engine.end_innings():
             # Show innings break
-            messagebox.showinfo("Innings Break", 
-                              f"First innings complete!\nTarget: {self.target + 1} runs")
+            self.notify("Innings Break", 
+                        f"First innings complete!\nTarget: {self.engine.target + 1} runs")
             
-            self.setup_game_interface()
+            self.refresh_game_interface()
         else:
             # Game over
             self.show_game_result()
@@ -471,6 +780,16 @@ class CricketGame:
     
     def show_game_result(self):
         """Show final game result"""
+        engine = self.engine
+        if self.game_mode == "bots":
+            self.bot_wins[engine.winner()] += 1
+            if self.bot_matches_left:
+                if self.render_balls:
+                    self.schedule("bot", None, self.start_bot_match)
+                return
+            self.render_balls = True
+        else:
+            self.record_match()
         self.clear_screen()
         
         # Title
@@ -481,8 +800,8 @@ class CricketGame:
         score_frame = tk.Frame(self.root, bg="#1e3a8a")
         score_frame.pack(pady=20)
         
-        p1_final = f"{self.player1_team}: {self.player1_score}/{self.player1_wickets}"
-        p2_final = f"{self.player2_team}: {self.player2_score}/{self.player2_wickets}"
+        p1_final = f"{self.player1_team}: {engine.player1_score}/{engine.player1_wickets}"
+        p2_final = f"{self.player2_team}: {engine.player2_score}/{engine.player2_wickets}"
         
         tk.Label(score_frame, text=p1_final, font=("Arial", 16, "bold"), 
                 fg="white", bg="#1e3a8a").pack(pady=5)
@@ -490,10 +809,11 @@ class CricketGame:
                 fg="white", bg="#1e3a8a").pack(pady=5)
         
         # Winner announcement
-        if self.player1_score > self.player2_score:
+        winner = engine.winner()
+        if winner == "player1":
             winner_text = f"{self.player1_team} WINS!"
             winner_color = "#22c55e"
-        elif self.player2_score > self.player1_score:
+        elif winner == "player2":
             winner_text = f"{self.player2_team} WINS!"
             winner_color = "#22c55e"
         else:
@@ -503,6 +823,32 @@ class CricketGame:
         tk.Label(self.root, text=winner_text, font=("Arial", 20, "bold"), 
                 fg=winner_color, bg="#1e3a8a").pack(pady=30)
         
+        # Totals over every bot match in the run
+        if self.game_mode == "bots":
+            played = sum(self.bot_wins.values())
+            tk.Label(self.root, text=f"{self.player1_name} {self.bot_wins['player1']} - "
+                                     f"{self.bot_wins['player2']} {self.player2_name}, "
+                                     f"{self.bot_wins[None]} tied, in {played} matches", 
+                    font=("Arial", 12), fg="white", bg="#1e3a8a").pack()
+        
+        # Seed for replaying this match exactly; bot runs share one stream
+        if self.game_mode != "online" and not self.resumed:
+            seed_label = "Run seed" if self.game_mode == "bots" else "Match seed"
+            tk.Label(self.root, text=f"{seed_label}: {self.rng.seed}", font=("Arial", 10), 
+                    fg="white", bg="#1e3a8a").pack()
+        
+        # Replay button
+        if self.game_mode != "bots" and self.replay is not None:
+            replay_btn = tk.Button(self.root, text="WATCH REPLAY", 
+                                  font=("Arial", 14), bg="#8b5cf6", fg="white",
+                                  command=self.show_replay, width=15)
+            replay_btn.pack(pady=5)
+        
+        leaderboard_btn = tk.Button(self.root, text="LEADERBOARD", 
+                                   font=("Arial", 14), bg="#f59e0b", fg="white",
+                                   command=self.setup_leaderboard, width=15)
+        leaderboard_btn.pack(pady=5)
+        
         # Play again button
         play_again_btn = tk.Button(self.root, text="PLAY AGAIN", 
                                   font=("Arial", 16), bg="#3b82f6", fg="white",
@@ -515,36 +861,284 @@ class CricketGame:
                             command=self.root.quit, width=15, height=2)
         exit_btn.pack(pady=10)
     
+    def record_match(self):
+        """Save a finished match to the log, archive and career stats"""
+        engine = self.engine
+        self.disconnect_online()
+        self.ball_log.flush()
+        self.archive.add_match(engine.match_id, self.player1_team, self.player2_team,
+                               engine.result(), self.teams)
+        self.archive.flush()
+        self.stats.add_match(engine.match_id, self.player1_team, self.player2_team,
+                             engine.result(), self.teams)
+        self.stats.save()
+        # Kept for WATCH REPLAY until the next match; nothing was recorded
+        # if the engine was reset rather than started
+        self.replay = self.recorder.replay
+    
+    def setup_leaderboard(self):
+        """Show the career run scorers, best innings and team records"""
+        self.clear_screen()
+        stats = self.stats
+        
+        tk.Label(self.root, text="Leaderboard", font=("Arial", 20, "bold"), 
+                fg="white", bg="#1e3a8a").pack(pady=20)
+        tk.Label(self.root, text=f"{stats.matches} matches played", font=("Arial", 11), 
+                fg="yellow", bg="#1e3a8a").pack()
+        
+        tables_frame = tk.Frame(self.root, bg="#1e3a8a")
+        tables_frame.pack(pady=10)
+        
+        # Most career runs
+        runs_frame = tk.Frame(tables_frame, bg="#1e3a8a")
+        runs_frame.pack(side=tk.LEFT, padx=20, anchor=tk.N)
+        tk.Label(runs_frame, text="Most Runs", font=("Arial", 14, "bold"), 
+                fg="white", bg="#1e3a8a").pack(pady=5)
+        for rank, (player, team, runs, average) in enumerate(stats.leaderboard(), start=1):
+            average_text = f"{average:.1f}" if average is not None else "-"
+            tk.Label(runs_frame, text=f"{rank}. {player} ({team}) {runs} runs, avg {average_text}", 
+                    font=("Arial", 11), fg="white", bg="#1e3a8a").pack(anchor=tk.W)
+        
+        # Highest single innings
+        innings_frame = tk.Frame(tables_frame, bg="#1e3a8a")
+        innings_frame.pack(side=tk.LEFT, padx=20, anchor=tk.N)
+        tk.Label(innings_frame, text="Best Innings", font=("Arial", 14, "bold"), 
+                fg="white", bg="#1e3a8a").pack(pady=5)
+        for rank, (player, team, _, runs) in enumerate(stats.best_innings(), start=1):
+            tk.Label(innings_frame, text=f"{rank}. {player} ({team}) {runs}", 
+                    font=("Arial", 11), fg="white", bg="#1e3a8a").pack(anchor=tk.W)
+        
+        # Team records
+        teams_frame = tk.Frame(tables_frame, bg="#1e3a8a")
+        teams_frame.pack(side=tk.LEFT, padx=20, anchor=tk.N)
+        tk.Label(teams_frame, text="Teams (W/L/T)", font=("Arial", 14, "bold"), 
+                fg="white", bg="#1e3a8a").pack(pady=5)
+        for team, won, lost, tied in stats.team_leaderboard():
+            tk.Label(teams_frame, text=f"{team}: {won}/{lost}/{tied}", 
+                    font=("Arial", 11), fg="white", bg="#1e3a8a").pack(anchor=tk.W)
+        
+        tk.Button(self.root, text="Main Menu", 
+                 font=("Arial", 12), bg="#ef4444", fg="white",
+                 command=self.restart_game, width=10).pack(pady=20)
+        
+    def show_replay(self):
+        """Step through the finished match on the game screen"""
+        self.game_mode = "replay"
+        # Positions are restored into a bare engine so no listener sees them
+        self.live_engine = self.engine
+        self.engine = MatchEngine()
+        self.engine.restore(self.replay.seek(self.replay.first_ball))
+        self.replay_ball = None
+        self.setup_game_interface()
+        self.set_action_state(tk.DISABLED)
+        
+        # Replay controls
+        controls_frame = tk.Frame(self.root, bg="#1e3a8a")
+        controls_frame.pack(pady=10)
+        
+        tk.Button(controls_frame, text="< Prev", font=("Arial", 12), bg="#3b82f6", fg="white",
+                 command=lambda: self.show_replay_ball(self.replay_ball - 1)).pack(side=tk.LEFT, padx=5)
+        self.replay_scale = tk.Scale(controls_frame, from_=self.replay.first_ball, to=self.replay.last_ball,
+                                     orient=tk.HORIZONTAL, length=400, label="Ball",
+                                     command=lambda value: self.show_replay_ball(int(float(value))))
+        self.replay_scale.pack(side=tk.LEFT, padx=5)
+        tk.Button(controls_frame, text="Next >", font=("Arial", 12), bg="#3b82f6", fg="white",
+                 command=lambda: self.show_replay_ball(self.replay_ball + 1)).pack(side=tk.LEFT, padx=5)
+        
+        tk.Button(self.root, text="Main Menu", 
+                 font=("Arial", 12), bg="#ef4444", fg="white",
+                 command=self.restart_game, width=10).pack(pady=10)
+        
+        self.show_replay_ball(self.replay.first_ball)
+        
+    def show_replay_ball(self, ball):
+        """Show the match as it stood after the given ball"""
+        ball = min(max(ball, self.replay.first_ball), self.replay.last_ball)
+        if ball == self.replay_ball:
+            return
+        self.replay_ball = ball
+        if self.replay_scale.get() != ball:
+            self.replay_scale.set(ball)
+        
+        self.engine.restore(self.replay.seek(ball))
+        self.refresh_game_interface()
+        if ball == self.replay.first_ball:
+            self.action_prompt.config(text="Start of replay")
+            return
+        bat, bowl = self.replay.move(ball)
+        outcome = "OUT!" if bat == bowl else f"+{bat} runs"
+        self.action_prompt.config(text=f"Ball {ball}: Bat {bat}, Bowl {bowl} - {outcome}")
+        
+    def run_bots(self, policy1, policy2, matches=1, render_balls=False, teams=None, rng=None, listeners=()):
+        """Play matches between two policies through the normal game loop
+        
+        With render_balls off no game screen is drawn and balls are played in
+        a tight loop; only the last show_game_result is shown. Bot matches are
+        not added to the archive or career stats and leave no replay. Tosses
+        come from rng, a fresh MatchRNG when not given, whose seed reproduces
+        the whole run when the policies draw from it too. listeners, such as
+        a BallLog, are attached to the bots' engine.
+        """
+        self.game_mode = "bots"
+        self.rng = rng or MatchRNG()
+        self.resumed = False
+        # Bots play on their own engine, without the game's ball log or replay recorder
+        self.live_engine = self.engine
+        self.engine = MatchEngine()
+        attach_metrics(self.engine)
+        self.engine.listeners.extend(listeners)
+        self.seats = {"player1": policy1, "player2": policy2}
+        self.player1_name = type(policy1).__name__
+        self.player2_name = type(policy2).__name__
+        self.player1_team, self.player2_team = teams or self.teams.names[:2]
+        self.render_balls = render_balls
+        self.bot_matches_left = matches
+        self.bot_wins = {"player1": 0, "player2": 0, None: 0}
+        self.saved_pacing = self.pacing_var.get()
+        if not render_balls:
+            self.pacing_var.set("instant")
+        
+        self.start_bot_match()
+        while not render_balls and self.bot_matches_left:
+            self.start_bot_match()
+        
+    def start_bot_match(self):
+        """Toss and play one bot match; without rendering it is played to the end here"""
+        if self.game_mode != "bots":
+            return
+        self.bot_matches_left -= 1
+        self.perform_toss(self.rng.coin())
+        if not self.render_balls:
+            while not self.engine.finished:
+                self.play_bot_ball()
+        
+    def play_bot_ball(self):
+        """Ask both seats for their numbers and play the ball"""
+        engine = self.engine
+        if self.game_mode != "bots" or engine.finished:
+            return
+        batting = engine.current_batting
+        bat_number = self.seats[batting].choose(engine, True)
+        bowl_number = self.seats[other_side(batting)].choose(engine, False)
+        self.process_batting_result(bat_number, bowl_number)
+        
+    def schedule(self, key, delay_ms, callback):
+        """Run callback after delay_ms (None: when idle), replacing anything queued under key"""
+        self.cancel_scheduled(key)
+        if delay_ms is None:
+            self.after_ids[key] = self.root.after_idle(self.run_scheduled, key, callback)
+        else:
+            self.after_ids[key] = self.root.after(delay_ms, self.run_scheduled, key, callback)
+        
+    def run_scheduled(self, key, callback):
+        """Forget a scheduled callback's handle and run it"""
+        self.after_ids.pop(key, None)
+        callback()
+        
+    def cancel_scheduled(self, *keys):
+        """Cancel the queued callbacks for keys, or all of them"""
+        for key in keys or list(self.after_ids):
+            after_id = self.after_ids.pop(key, None)
+            if after_id is not None:
+                self.root.after_cancel(after_id)
+        
     def restart_game(self):
         """Restart the game"""
+        # Drop callbacks left over from the old screen
+        self.cancel_scheduled()
+        self.hide_overlay()
+        self.ball_pending = False
+        
         # Reset all game variables
+        if self.game_mode in ("replay", "bots"):
+            self.engine = self.live_engine
+        if self.game_mode == "bots":
+            self.player1_name = "Player 1"
+            self.player2_name = "Player 2"
+            self.pacing_var.set(self.saved_pacing)
+        self.render_balls = True
+        self.disconnect_online()
+        self.engine.abandon()
         self.game_mode = None
         self.player1_team = None
         self.player2_team = None
         self.toss_winner = None
         self.batting_first = None
-        self.current_innings = 1
-        self.current_batsman_index = 0
-        self.player1_score = 0
-        self.player2_score = 0
-        self.player1_wickets = 0
-        self.player2_wickets = 0
-        self.current_player_score = 0
-        self.target = 0
-        self.player1_individual_scores = [0] * 11
-        self.player2_individual_scores = [0] * 11
+        self.engine.reset()
         
         # Return to main menu
         self.setup_main_menu()
     
+    def save_match(self):
+        """Save an unfinished local match so it can be resumed later"""
+        engine = self.engine
+        if not engine.started or engine.finished or self.game_mode not in ("computer", "player"):
+            return
+        state = {
+            "game_mode": self.game_mode,
+            "opponent": self.opponent_var.get(),
+            "player1_team": self.player1_team,
+            "player2_team": self.player2_team,
+            "player1_name": self.player1_name,
+            "player2_name": self.player2_name,
+            "snapshot": engine.snapshot().hex(),
+        }
+        with open(self.save_path + ".tmp", "w") as f:
+            json.dump(state, f)
+        os.replace(self.save_path + ".tmp", self.save_path)
+        
+    def resume_match(self):
+        """Continue the match saved by save_match"""
+        try:
+            with open(self.save_path) as f:
+                state = json.load(f)
+            snapshot = bytes.fromhex(state["snapshot"])
+            if state["game_mode"] not in ("computer", "player"):
+                raise ValueError(f"unknown game mode {state['game_mode']!r}")
+            policy = POLICIES[state["opponent"]] if state["game_mode"] == "computer" else RandomPolicy
+            names = [state[key] for key in ("player1_team", "player2_team", "player1_name", "player2_name")]
+            for team in names[:2]:
+                if team not in self.teams:
+                    raise ValueError(f"team {team!r} is no longer in the rosters")
+            # Check the snapshot on a scratch engine before touching the live one
+            saved = MatchEngine.from_snapshot(snapshot)
+            if not saved.started or saved.finished:
+                raise ValueError("the saved match is already over")
+        except (OSError, ValueError, KeyError, TypeError, struct.error) as exc:
+            messagebox.showerror("Error", f"Could not resume the saved match:\n{exc}")
+            self.setup_main_menu()
+            return
+        os.remove(self.save_path)
+        
+        self.opponent_var.set(state["opponent"])
+        self.player1_team, self.player2_team, self.player1_name, self.player2_name = names
+        self.game_mode = state["game_mode"]
+        self.rng = MatchRNG()
+        self.resumed = True
+        self.opponent = policy(rng=self.rng)
+        
+        self.engine.resume(snapshot)
+        self.batting_first = self.engine.batting_first
+        self.setup_game_interface()
+        if self.engine.should_end_innings():
+            self.end_innings()
+        
+    def close(self):
+        """Window closed: save any unfinished match, then quit"""
+        self.save_match()
+        self.root.destroy()
+        
     def clear_screen(self):
         """Clear all widgets from the screen"""
         for widget in self.root.winfo_children():
-            widget.destroy()
+            if widget is not self.overlay:
+                widget.destroy()
     
     def run(self):
         """Start the game"""
         self.root.mainloop()
+        self.ball_log.close()
+        self.archive.close()
 
 # Create and run the game
 if __name__ == "__main__":
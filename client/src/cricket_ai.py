@@ -0,0 +1,96 @@
+"""Computer opponents that learn from the human's choices
+
+PatternPolicy keeps a small n-gram frequency model of the numbers its
+opponent has picked, separately for batting and bowling. When bowling it
+aims at the number the batter is most likely to pick next; when batting it
+picks the number with the best expected runs given how likely the bowler is
+to match it. Updates and decisions touch a fixed number of counters, so each
+ball costs O(1) and memory stays bounded at 6 ** order contexts per role.
+"""
+from cricket_engine import NUMBERS, RandomPolicy
+from cricket_equilibrium import EquilibriumPolicy
+from cricket_rng import MatchRNG
+
+# Counts in a context are halved once they reach this total, so old habits fade
+COUNT_LIMIT = 64
+
+
+class PatternModel:
+    """Frequency counts of the next number after the last `order` numbers"""
+
+    def __init__(self, order=2):
+        self.order = order
+        self.history = ()
+        self.counts = {}      # context tuple -> [count for 1..6]
+        self.totals = {}      # context tuple -> total count
+
+    def update(self, number):
+        """Record the number the opponent just picked"""
+        history = self.history
+        for length in range(len(history) + 1):
+            # Update every suffix of the context so short contexts back off longer ones
+            context = history[len(history) - length:]
+            counts = self.counts.get(context)
+            if counts is None:
+                counts = self.counts[context] = [0] * len(NUMBERS)
+                self.totals[context] = 0
+            counts[number - 1] += 1
+            total = self.totals[context] + 1
+            if total >= COUNT_LIMIT:
+                counts[:] = [c // 2 for c in counts]
+                total = sum(counts)
+            self.totals[context] = total
+        self.history = (history + (number,))[-self.order:]
+
+    def distribution(self):
+        """Estimated probability of each number 1-6 being picked next"""
+        history = self.history
+        for length in range(len(history), -1, -1):
+            context = history[len(history) - length:]
+            total = self.totals.get(context)
+            if total:
+                # Add-one smoothing keeps every number possible
+                scale = 1.0 / (total + len(NUMBERS))
+                return [(c + 1) * scale for c in self.counts[context]]
+        return [1.0 / len(NUMBERS)] * len(NUMBERS)
+
+
+class PatternPolicy:
+    """Opponent that predicts the other side's next number from recent patterns"""
+
+    def __init__(self, order=2, exploration=0.1, rng=None):
+        self.rng = rng or MatchRNG()
+        self.exploration = exploration
+        self.batter_model = PatternModel(order)   # numbers the opponent bats
+        self.bowler_model = PatternModel(order)   # numbers the opponent bowls
+        self.batting = None
+
+    def choose(self, engine, batting):
+        """Pick a number for the next ball"""
+        self.batting = batting
+        if self.rng.random() < self.exploration:
+            return self.rng.choice(NUMBERS)
+        if batting:
+            # Expected runs of each shot given the chance the bowler matches it
+            bowl = self.bowler_model.distribution()
+            return max(NUMBERS, key=lambda n: n * (1 - bowl[n - 1]))
+        bat = self.batter_model.distribution()
+        return max(NUMBERS, key=lambda n: bat[n - 1])
+
+    def observe(self, result):
+        """Learn the opponent's number from a finished ball"""
+        if self.batting is None:
+            return
+        if self.batting:
+            self.bowler_model.update(result.bowl)
+        else:
+            self.batter_model.update(result.bat)
+        self.batting = None
+
+
+# Opponent policies by name, for the GUI and command-line tools
+POLICIES = {
+    "random": RandomPolicy,
+    "pattern": PatternPolicy,
+    "equilibrium": EquilibriumPolicy,
+}
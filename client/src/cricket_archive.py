@@ -0,0 +1,206 @@
+"""Memory-mapped archive of finished matches with secondary indexes
+
+Each match is one fixed 64 byte record in the archive file, which is
+memory-mapped for reading. Team and player names live in a small sidecar
+JSON file and records refer to teams by id. Indexes by team, batsman name,
+outcome and individual score are built by the first query and kept up to
+date as matches are added, so queries only touch the records they need and
+a writer that never queries never scans the archive.
+"""
+import json
+import mmap
+import os
+import struct
+from array import array
+
+from cricket_engine import TEAM_SIZE
+
+MAGIC = b"CRKMATCH"
+
+# match id, player1 team, player2 team, batting first (1/2), winner (0 tie, 1, 2),
+# player1 score, player2 score, player1 wickets, player2 wickets,
+# then player1 and player2 individual scores
+MATCH = struct.Struct("<QHHBBHHBB" + "H" * (2 * TEAM_SIZE))
+INDIVIDUAL_OFFSET = struct.calcsize("<QHHBBHHBB")
+SCORE = struct.Struct("<H")
+SIDES = {"player1": 1, "player2": 2}
+
+# Match outcome index keys
+BATTING_FIRST_WON = "batting_first_won"
+CHASE_WON = "chase_won"
+TIE = "tie"
+
+
+def _outcome(batting_first, winner):
+    if winner == 0:
+        return TIE
+    return BATTING_FIRST_WON if winner == batting_first else CHASE_WON
+
+
+class MatchArchive:
+    """Append-only archive of MatchResults with indexed queries"""
+
+    def __init__(self, path):
+        self.path = path
+        self.names_path = path + ".names"
+        self.teams = []        # team id -> (name, players)
+        self.team_ids = {}     # team name -> id
+        if os.path.exists(self.names_path):
+            with open(self.names_path) as f:
+                for name, players in json.load(f):
+                    self.team_ids[name] = len(self.teams)
+                    self.teams.append((name, tuple(players)))
+
+        self.file = open(path, "a+b")
+        size = self.file.tell()
+        self.file.seek(0)
+        header = self.file.read(len(MAGIC))
+        if header != MAGIC[:len(header)]:
+            self.file.close()
+            raise ValueError(f"{path} is not a match archive")
+        if size < len(MAGIC):
+            # Empty, or cut short while the header was being written
+            self.file.truncate(0)
+            self.file.write(MAGIC)
+            self.file.flush()
+            size = len(MAGIC)
+        self.count = (size - len(MAGIC)) // MATCH.size
+        # Drop a torn record left by a crash mid-write
+        self.file.truncate(len(MAGIC) + self.count * MATCH.size)
+        self.mm = None
+        self.mapped_count = 0
+
+        self.indexed = False
+        self.by_team = {}      # team id -> array of record numbers
+        self.by_outcome = {BATTING_FIRST_WON: array("I"), CHASE_WON: array("I"), TIE: array("I")}
+        self.by_score = {}     # individual score -> array of record * 2 * TEAM_SIZE + slot
+        self.by_batsman = {}   # batsman name -> list of (team id, slot)
+
+    def _build_indexes(self):
+        """Index every archived match; called by the first query"""
+        if self.indexed:
+            return
+        self.indexed = True
+        for team_id, (_, players) in enumerate(self.teams):
+            self._index_players(team_id, players)
+        self._remap()
+        for number, fields in enumerate(MATCH.iter_unpack(self.mm[len(MAGIC):len(MAGIC) + self.count * MATCH.size])
+                                        if self.count else ()):
+            self._index_match(number, fields)
+
+    def _remap(self):
+        if self.count == self.mapped_count:
+            return
+        self.file.flush()
+        if self.mm is not None:
+            self.mm.close()
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.mapped_count = self.count
+
+    def _index_players(self, team_id, players):
+        for slot, player in enumerate(players):
+            self.by_batsman.setdefault(player, []).append((team_id, slot))
+
+    def _index_match(self, number, fields):
+        team1, team2, batting_first, winner = fields[1:5]
+        self.by_team.setdefault(team1, array("I")).append(number)
+        self.by_team.setdefault(team2, array("I")).append(number)
+        self.by_outcome[_outcome(batting_first, winner)].append(number)
+        base = number * 2 * TEAM_SIZE
+        for slot, score in enumerate(fields[9:]):
+            if score:
+                self.by_score.setdefault(score, array("Q")).append(base + slot)
+
+    def team_id(self, name, players):
+        """Id for a team, registering it on first use"""
+        team_id = self.team_ids.get(name)
+        if team_id is None:
+            team_id = len(self.teams)
+            self.team_ids[name] = team_id
+            self.teams.append((name, tuple(players)))
+            if self.indexed:
+                self._index_players(team_id, players)
+            with open(self.names_path, "w") as f:
+                json.dump(self.teams, f)
+        return team_id
+
+    def add_match(self, match_id, team1, team2, result, rosters=None):
+        """Append a finished match; rosters maps team name to its players"""
+        rosters = rosters or {}
+        team1_id = self.team_id(team1, rosters.get(team1, ()))
+        team2_id = self.team_id(team2, rosters.get(team2, ()))
+        winner = SIDES.get(result.winner, 0)
+        fields = (match_id, team1_id, team2_id, SIDES[result.batting_first], winner,
+                  result.player1_score, result.player2_score,
+                  result.player1_wickets, result.player2_wickets,
+                  *result.player1_individual_scores, *result.player2_individual_scores)
+        self.file.seek(0, os.SEEK_END)
+        self.file.write(MATCH.pack(*fields))
+        if self.indexed:
+            self._index_match(self.count, fields)
+        self.count += 1
+
+    def _individual(self, number, side, slot):
+        self._remap()
+        offset = len(MAGIC) + number * MATCH.size + INDIVIDUAL_OFFSET
+        return SCORE.unpack_from(self.mm, offset + 2 * ((side - 1) * TEAM_SIZE + slot))[0]
+
+    def _match(self, number):
+        self._remap()
+        return MATCH.unpack_from(self.mm, len(MAGIC) + number * MATCH.size)
+
+    def career_runs(self, batsman):
+        """Total runs scored by a batsman across every archived match"""
+        self._build_indexes()
+        runs = 0
+        for team_id, slot in self.by_batsman.get(batsman, ()):
+            for number in self.by_team.get(team_id, ()):
+                side = 1 if self._match(number)[1] == team_id else 2
+                runs += self._individual(number, side, slot)
+        return runs
+
+    def top_scores(self, k=10):
+        """Highest individual scores as (runs, batsman, team, match id)"""
+        self._build_indexes()
+        top = []
+        for score in sorted(self.by_score, reverse=True):
+            for position in self.by_score[score]:
+                number, slot = divmod(position, 2 * TEAM_SIZE)
+                side, slot = divmod(slot, TEAM_SIZE)
+                fields = self._match(number)
+                name, players = self.teams[fields[1 + side]]
+                batsman = players[slot] if slot < len(players) else f"#{slot + 1}"
+                top.append((score, batsman, name, fields[0]))
+                if len(top) == k:
+                    return top
+        return top
+
+    def win_rate(self, team, chasing=None):
+        """(wins, matches) for a team; chasing=True/False limits to one role"""
+        self._build_indexes()
+        team_id = self.team_ids.get(team)
+        wins = played = 0
+        for number in self.by_team.get(team_id, ()):
+            fields = self._match(number)
+            side = 1 if fields[1] == team_id else 2
+            if chasing is not None and (fields[3] != side) != chasing:
+                continue
+            played += 1
+            wins += fields[4] == side
+        return wins, played
+
+    def match_ids(self, outcome):
+        """Match ids with the given outcome (BATTING_FIRST_WON, CHASE_WON or TIE)"""
+        self._build_indexes()
+        return [self._match(number)[0] for number in self.by_outcome[outcome]]
+
+    def flush(self):
+        """Make appended matches visible to other readers of the file"""
+        self.file.flush()
+
+    def close(self):
+        """Close the archive"""
+        if self.mm is not None:
+            self.mm.close()
+            self.mm = None
+        self.file.close()
@@ -0,0 +1,127 @@
+"""Vectorized bulk match simulator
+
+Simulates many matches at once with NumPy arrays instead of one Python call
+per ball. The rules are the same as MatchEngine: a ball is OUT when the bat
+and bowl numbers match, otherwise the batsman scores the bat number, and an
+innings ends at ten wickets or, in the chase, once the target is passed.
+
+NumPy is only needed for this module; the game itself does not import it.
+"""
+from collections import namedtuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from cricket_engine import MAX_WICKETS, TEAM_SIZE
+
+# Balls drawn per match in one go; innings still running afterwards draw another block
+BLOCK_BALLS = 64
+# Matches simulated per chunk, bounds peak memory of the per-ball arrays
+CHUNK_MATCHES = 1 << 16
+
+# Winner codes used in BatchResult.winner
+TIE, PLAYER1, PLAYER2 = 0, 1, 2
+
+# Per-match arrays for a batch of simulated matches
+BatchResult = namedtuple("BatchResult", "player1_bats_first player1_score player2_score "
+                                        "player1_wickets player2_wickets "
+                                        "player1_individual_scores player2_individual_scores "
+                                        "winner balls")
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("cricket_batch needs NumPy: pip install numpy")
+
+
+def _simulate_innings(rng, n, target=None):
+    """Simulate one innings for n matches, chasing target (an array) if given"""
+    runs = np.zeros(n, dtype=np.int32)
+    wickets = np.zeros(n, dtype=np.int32)
+    balls = np.zeros(n, dtype=np.int32)
+    individual = np.zeros((n, TEAM_SIZE), dtype=np.int32)
+    active = np.arange(n)
+
+    while active.size:
+        m = active.size
+        bat = rng.integers(1, 7, size=(m, BLOCK_BALLS), dtype=np.int8)
+        bowl = rng.integers(1, 7, size=(m, BLOCK_BALLS), dtype=np.int8)
+        out = bat == bowl
+        scored = np.where(out, 0, bat).astype(np.int32)
+
+        # Score and wickets before each ball, to know which balls are actually bowled
+        wickets_before = wickets[active, None] + np.cumsum(out, axis=1, dtype=np.int32) - out
+        live = wickets_before < MAX_WICKETS
+        if target is not None:
+            runs_before = runs[active, None] + np.cumsum(scored, axis=1, dtype=np.int32) - scored
+            live &= runs_before <= target[active, None]
+
+        scored *= live
+        runs[active] += scored.sum(axis=1, dtype=np.int32)
+        wickets[active] += (out & live).sum(axis=1, dtype=np.int32)
+        balls[active] += live.sum(axis=1, dtype=np.int32)
+
+        # The batsman at the crease is the one after every wicket fallen so far
+        hits = live & ~out
+        slots = (np.arange(m)[:, None] * TEAM_SIZE + wickets_before)[hits]
+        totals = np.bincount(slots, weights=scored[hits], minlength=m * TEAM_SIZE)
+        individual[active] += totals.reshape(m, TEAM_SIZE).astype(np.int32)
+
+        still = wickets[active] < MAX_WICKETS
+        if target is not None:
+            still &= runs[active] <= target[active]
+        active = active[still]
+
+    return runs, wickets, individual, balls
+
+
+def _simulate_chunk(rng, n, player1_bats_first):
+    runs1, wickets1, individual1, balls1 = _simulate_innings(rng, n)
+    runs2, wickets2, individual2, balls2 = _simulate_innings(rng, n, target=runs1)
+
+    first = player1_bats_first
+    player1_score = np.where(first, runs1, runs2)
+    player2_score = np.where(first, runs2, runs1)
+    winner = np.full(n, TIE, dtype=np.int8)
+    winner[player1_score > player2_score] = PLAYER1
+    winner[player2_score > player1_score] = PLAYER2
+
+    return BatchResult(first, player1_score, player2_score,
+                       np.where(first, wickets1, wickets2),
+                       np.where(first, wickets2, wickets1),
+                       np.where(first[:, None], individual1, individual2),
+                       np.where(first[:, None], individual2, individual1),
+                       winner, balls1 + balls2)
+
+
+def iter_simulate_batch(n, seed=None, batting_first=None, chunk=CHUNK_MATCHES):
+    """Simulate n matches, yielding a BatchResult per chunk of matches
+
+    batting_first may be "player1" or "player2" to fix the batting order;
+    by default each match has its own toss.
+    """
+    _require_numpy()
+    rng = np.random.default_rng(seed)
+    remaining = n
+    while remaining > 0:
+        size = min(chunk, remaining)
+        if batting_first is None:
+            first = rng.random(size) < 0.5
+        else:
+            first = np.full(size, batting_first == "player1")
+        yield _simulate_chunk(rng, size, first)
+        remaining -= size
+
+
+def simulate_batch(n, seed=None, batting_first=None, chunk=CHUNK_MATCHES):
+    """Simulate n matches and return a single BatchResult of arrays"""
+    parts = list(iter_simulate_batch(n, seed, batting_first, chunk))
+    if len(parts) == 1:
+        return parts[0]
+    _require_numpy()
+    if not parts:
+        # No matches: empty arrays of the usual types and shapes
+        return _simulate_chunk(np.random.default_rng(seed), 0, np.zeros(0, dtype=bool))
+    return BatchResult(*(np.concatenate(field) for field in zip(*parts)))
@@ -0,0 +1,229 @@
+"""Benchmarks for the game loop, screen transitions and simulation throughput
+
+    python cricket_bench.py                   # run and compare with the baseline
+    python cricket_bench.py --save-baseline   # record new baseline numbers
+    xvfb-run python cricket_bench.py          # include the tkinter screens
+
+Each benchmark is timed several times and the median run kept, which moves
+far less between runs than the fastest or a single timing. Results are
+compared with bench_baseline.json next to this file; anything worse than
+the baseline by more than --threshold is reported as a regression and the
+exit status is 1. GUI benchmarks are skipped when no display is available.
+
+Absolute timings depend on the machine, so every run also times a fixed
+reference loop that does not touch the game code, and baseline numbers are
+scaled by how fast this host runs it compared with the host that saved the
+baseline. That only corrects for overall CPU speed, so no baseline ships
+with the code: run --save-baseline once on the machine that runs the
+comparison, under xvfb-run so the gui_* screen timings are recorded too.
+Saving merges into the existing baseline, so a later run with a display adds
+the GUI entries.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from cricket_engine import MatchEngine, RandomPolicy, simulate_match
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(HERE, "bench_baseline.json")
+DEFAULT_THRESHOLD = 0.2
+# Benchmark used to scale the baseline to this host's speed
+REFERENCE = "host_reference"
+REPEATS = 9
+
+
+def _median_time(func, repeats=REPEATS):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def bench_host_reference(loops=300_000):
+    """Fixed pure-Python loop that gauges the host's speed, in loops per second"""
+    def run():
+        rng = random.Random(0)
+        counts = [0] * 7
+        for _ in range(loops):
+            counts[rng.randint(1, 6)] += 1
+    return loops / _median_time(run), "loops/s", True
+
+
+def bench_ball_hot_path(balls=200_000):
+    """play_ball plus should_end_innings, in balls per second"""
+    rng = random.Random(1)
+    pairs = [(rng.randint(1, 6), rng.randint(1, 6)) for _ in range(balls)]
+
+    def run():
+        engine = MatchEngine()
+        for bat, bowl in pairs:
+            engine.play_ball(bat, bowl)
+            if engine.should_end_innings() and engine.end_innings():
+                engine.reset()
+    return balls / _median_time(run), "balls/s", True
+
+
+def bench_match_simulation(matches=2_000):
+    """simulate_match between random policies, in matches per second"""
+    def run():
+        rng = random.Random(2)
+        policy = RandomPolicy(rng)
+        for _ in range(matches):
+            simulate_match(policy, policy, rng=rng)
+    return matches / _median_time(run), "matches/s", True
+
+
+def bench_batch_simulation(matches=100_000):
+    """Vectorized simulate_batch, in matches per second (needs NumPy)"""
+    import cricket_batch
+    if cricket_batch.np is None:
+        return None
+    return matches / _median_time(lambda: cricket_batch.simulate_batch(matches, seed=3), 5), "matches/s", True
+
+
+def _load_game():
+    spec = importlib.util.spec_from_file_location("cricket_game", os.path.join(HERE, "cricket-game.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def gui_benchmarks(calls=50):
+    """Milliseconds per screen transition, or {} without a display"""
+    import tkinter as tk
+    try:
+        module = _load_game()
+        game = module.CricketGame()
+    except tk.TclError:
+        return {}
+
+    game.pacing_var.set("instant")
+    game.game_mode = "computer"
+    game.player1_team, game.player2_team = list(game.teams)[:2]
+    game.engine.start("player1")
+
+    def per_call(func):
+        def run():
+            for _ in range(calls):
+                func()
+            game.root.update_idletasks()
+        return _median_time(run) / calls * 1000, "ms", False
+
+    def ball():
+        game.engine.play_ball(3, 4)
+        game.refresh_game_interface()
+
+    # Time the screen itself, not the disk writes of record_match
+    game.record_match = lambda: None
+
+    results = {
+        "gui_setup_game_interface": per_call(game.setup_game_interface),
+        "gui_refresh_per_ball": per_call(ball),
+        "gui_clear_screen": per_call(lambda: (game.setup_game_interface(), game.clear_screen())),
+        "gui_show_game_result": per_call(game.show_game_result),
+    }
+    game.root.destroy()
+    return results
+
+
+def run_benchmarks(include_gui=True):
+    """Run every benchmark; returns {name: {value, unit, higher_is_better}}"""
+    results = {}
+    for name, bench in ((REFERENCE, bench_host_reference),
+                        ("ball_hot_path", bench_ball_hot_path),
+                        ("match_simulation", bench_match_simulation),
+                        ("batch_simulation", bench_batch_simulation)):
+        outcome = bench()
+        if outcome is not None:
+            results[name] = outcome
+    if include_gui:
+        # Screens write logs and archives; keep them out of the user's data
+        os.environ["DATA_DIRECTORY"] = tempfile.mkdtemp(prefix="cricket-bench-")
+        results.update(gui_benchmarks())
+    # Time the reference again at the end and average the two, so a change
+    # of load while the suite runs does not skew every comparison
+    value, unit, higher = results[REFERENCE]
+    results[REFERENCE] = ((value + bench_host_reference()[0]) / 2, unit, higher)
+    return {name: {"value": value, "unit": unit, "higher_is_better": higher}
+            for name, (value, unit, higher) in results.items()}
+
+
+def compare(results, baseline, threshold):
+    """Return lines describing each result and the names that regressed
+
+    Baseline values are first scaled by the ratio of this run's host
+    reference speed to the baseline's.
+    """
+    speedup = 1.0
+    if REFERENCE in results and REFERENCE in baseline:
+        speedup = results[REFERENCE]["value"] / baseline[REFERENCE]["value"]
+    lines, regressions = [], []
+    for name, result in results.items():
+        line = f"{name:<28} {result['value']:>14.3f} {result['unit']}"
+        base = baseline.get(name)
+        if name == REFERENCE:
+            if base:
+                line += f"  (host {speedup:.2f}x the baseline host)"
+        elif base:
+            if result["higher_is_better"]:
+                change = result["value"] / (base["value"] * speedup) - 1
+            else:
+                change = base["value"] / speedup / result["value"] - 1
+            line += f"  ({change:+.1%} vs baseline)"
+            if change < -threshold:
+                line += "  REGRESSION"
+                regressions.append(name)
+        elif baseline:
+            line += "  (no baseline; run --save-baseline on this host)"
+        lines.append(line)
+    return lines, regressions
+
+
+def main(argv=None):
+    """Command-line entry point: run, compare and optionally save a baseline"""
+    parser = argparse.ArgumentParser(description="Benchmark the cricket game loop")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown before flagging a regression (default 0.2)")
+    parser.add_argument("--no-gui", action="store_true", help="skip the tkinter screen benchmarks")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(include_gui=not args.no_gui)
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    if args.save_baseline:
+        if REFERENCE in baseline and any(name not in results for name in baseline):
+            # Entries kept from another run, such as gui_* timings recorded
+            # with a display, are rescaled to this run's host speed
+            speedup = results[REFERENCE]["value"] / baseline[REFERENCE]["value"]
+            for entry in baseline.values():
+                entry["value"] *= speedup if entry["higher_is_better"] else 1 / speedup
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        baseline = {}
+    lines, regressions = compare(results, baseline, args.threshold)
+    print("\n".join(lines))
+    if not baseline and not args.save_baseline:
+        print(f"no baseline at {args.baseline}; run --save-baseline on this host first")
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+"""Live score fan-out from matches to many spectators
+
+A Broadcaster keeps one Channel per live match. BroadcastListener publishes
+each ball, innings change and match end of a MatchEngine to its channel as
+a compact newline-delimited JSON delta, encoded once into a window of the
+last `limit` deltas that every subscriber reads from. Publishing is O(1)
+however many spectators watch. A subscriber that falls more than `limit`
+deltas behind skips the backlog and gets one "sync" message with the latest
+full scoreboard instead, so a slow consumer costs bounded memory and never
+holds up the others.
+
+Spectators connect over TCP to serve_spectators and send one line:
+    {"type": "watch", "match_id": 3}    or    {"type": "list"}
+and then receive:
+    {"type": "matches", "matches": [{"match_id": 3, "player1_team": ..., ...}]}
+    {"type": "sync", "seq": 40, "state": {...full scoreboard...}}
+    {"type": "ball", "seq": 41, "side": "player1", "bat": 4, "bowl": 2, "out": false}
+    {"type": "innings", "seq": 90, "target": 212}
+    {"type": "end", "seq": 155, "winner": "player2", "abandoned": false}
+Subscribers can also be used in-process: subscribe() returns one, and
+`await subscriber.get()` yields the next chunk of encoded lines.
+"""
+import asyncio
+import json
+from collections import deque
+from itertools import islice
+
+from cricket_engine import MatchListener
+
+DEFAULT_SPECTATOR_PORT = 8766
+
+# Recent deltas kept per match; subscribers further behind are resynced
+BUFFER_LIMIT = 64
+
+
+def encode(message):
+    """Serialize one spectator message"""
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+def scoreboard(engine, info=None):
+    """Full scoreboard of a MatchEngine as sent in sync messages"""
+    state = dict(info or {})
+    state.update(match_id=engine.match_id, batting_first=engine.batting_first,
+                 innings=engine.current_innings, batsman=engine.current_batsman_index,
+                 player1=[engine.player1_score, engine.player1_wickets],
+                 player2=[engine.player2_score, engine.player2_wickets],
+                 target=engine.target, balls=engine.balls, finished=engine.finished,
+                 winner=engine.winner() if engine.finished and not engine.abandoned else None)
+    return state
+
+
+class Subscriber:
+    """One spectator's position in a channel's stream of updates"""
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.seq = None        # last update delivered; None until the first sync
+        self.closed = False
+        self.dropped = 0       # deltas skipped by resyncs
+
+    def close(self):
+        """Stop once the updates already published have been read"""
+        self.closed = True
+
+    async def get(self):
+        """Next chunk of encoded lines; None once the match is over and drained"""
+        channel = self.channel
+        while True:
+            if self.closed and self.seq == channel.seq:
+                return None
+            behind = channel.seq - self.seq if self.seq is not None else None
+            if behind is None or behind > len(channel.backlog):
+                # New, or too far behind: catch up with one sync of the latest scoreboard
+                if behind is not None:
+                    self.dropped += behind
+                self.seq = channel.seq
+                return channel.sync_message()
+            if behind:
+                self.seq = channel.seq
+                backlog = channel.backlog
+                return b"".join(islice(backlog, len(backlog) - behind, None))
+            if self.closed:
+                return None
+            await channel.changed()
+
+
+class Channel:
+    """Subscribers, recent updates and latest scoreboard of one match
+
+    Only the last `limit` encoded deltas are kept, shared by every
+    subscriber; each subscriber is just a position in that window.
+    """
+
+    def __init__(self, match_id, info=None, limit=BUFFER_LIMIT):
+        self.match_id = match_id
+        self.info = dict(info or {})
+        self.subscribers = set()
+        self.backlog = deque(maxlen=limit)
+        self.seq = 0
+        self.state = {}
+        self._sync = None
+        self._changed = None
+        self.finished = False
+
+    def changed(self):
+        """Future completed by the next publish or close, shared by all waiters"""
+        if self._changed is None:
+            self._changed = asyncio.get_running_loop().create_future()
+        return self._changed
+
+    def _wake(self):
+        if self._changed is not None:
+            if not self._changed.done():
+                self._changed.set_result(None)
+            self._changed = None
+
+    def publish(self, message, state):
+        """Append a delta for every subscriber and remember the scoreboard after it"""
+        self.seq += 1
+        message["seq"] = self.seq
+        self.state = state
+        self._sync = None
+        self.backlog.append(encode(message))
+        self._wake()
+
+    def sync_message(self):
+        """Encoded sync message for the latest scoreboard, built once per seq"""
+        if self._sync is None:
+            self._sync = encode({"type": "sync", "seq": self.seq, "state": self.state})
+        return self._sync
+
+    def close(self):
+        """End the match's stream for every subscriber"""
+        self.finished = True
+        for subscriber in self.subscribers:
+            subscriber.close()
+        self.subscribers.clear()
+        self._wake()
+
+
+class Broadcaster:
+    """Pub/sub hub with one channel per live match"""
+
+    def __init__(self, limit=BUFFER_LIMIT):
+        self.limit = limit
+        self.channels = {}
+
+    def open(self, match_id, info=None):
+        """Channel for a match, created on first use"""
+        channel = self.channels.get(match_id)
+        if channel is None:
+            channel = self.channels[match_id] = Channel(match_id, info, self.limit)
+        return channel
+
+    def subscribe(self, match_id):
+        """New Subscriber for a live match, or None if there is no such match"""
+        channel = self.channels.get(match_id)
+        if channel is None:
+            return None
+        subscriber = Subscriber(channel)
+        channel.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        """Drop a subscriber from its channel"""
+        subscriber.channel.subscribers.discard(subscriber)
+        subscriber.close()
+
+    def publish(self, match_id, message, state):
+        """Publish a delta to a live match's subscribers"""
+        channel = self.channels.get(match_id)
+        if channel is not None:
+            channel.publish(message, state)
+
+    def end(self, match_id, message, state):
+        """Publish the last message of a match and close its channel"""
+        channel = self.channels.pop(match_id, None)
+        if channel is not None:
+            channel.publish(message, state)
+            channel.close()
+
+    def live_matches(self):
+        """Info of every live match, as sent in the "matches" message"""
+        return [dict(channel.info, match_id=match_id) for match_id, channel in self.channels.items()]
+
+
+class BroadcastListener(MatchListener):
+    """Publishes a MatchEngine's balls and innings changes to a Broadcaster
+
+    The engine must run on the broadcaster's event loop, as the match
+    server's engines do.
+    """
+
+    def __init__(self, broadcaster, info=None):
+        self.broadcaster = broadcaster
+        self.info = info
+
+    def on_match_start(self, engine):
+        """Open the match channel with its starting scoreboard"""
+        self.broadcaster.open(engine.match_id, self.info).state = scoreboard(engine, self.info)
+
+    def on_ball(self, engine, result):
+        """Publish a ball delta"""
+        message = {"type": "ball", "side": result.batting, "bat": result.bat,
+                   "bowl": result.bowl, "out": result.out}
+        self.broadcaster.publish(engine.match_id, message, scoreboard(engine, self.info))
+
+    def on_innings_end(self, engine):
+        """Publish the new target when the first innings ends"""
+        if engine.finished:
+            return
+        message = {"type": "innings", "target": engine.target}
+        self.broadcaster.publish(engine.match_id, message, scoreboard(engine, self.info))
+
+    def on_match_end(self, engine):
+        """Publish the result and close the channel"""
+        message = {"type": "end", "winner": None if engine.abandoned else engine.winner(),
+                   "abandoned": engine.abandoned}
+        self.broadcaster.end(engine.match_id, message, scoreboard(engine, self.info))
+
+
+async def _handle_spectator(broadcaster, reader, writer):
+    subscriber = None
+    try:
+        line = await reader.readline()
+        try:
+            request = json.loads(line)
+        except ValueError:
+            request = None
+        if not isinstance(request, dict):
+            writer.write(encode({"type": "error", "message": "expected a JSON object"}))
+        elif request.get("type") == "list":
+            writer.write(encode({"type": "matches", "matches": broadcaster.live_matches()}))
+        elif request.get("type") == "watch":
+            subscriber = broadcaster.subscribe(request.get("match_id"))
+            if subscriber is None:
+                writer.write(encode({"type": "error", "message": "no such live match"}))
+            while subscriber is not None:
+                data = await subscriber.get()
+                if data is None:
+                    break
+                writer.write(data)
+                await writer.drain()
+        else:
+            writer.write(encode({"type": "error", "message": f"unexpected {request.get('type')!r}"}))
+        await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        if subscriber is not None:
+            broadcaster.unsubscribe(subscriber)
+        writer.close()
+
+
+async def serve_spectators(broadcaster, host="127.0.0.1", port=DEFAULT_SPECTATOR_PORT):
+    """Start the spectator feed for a Broadcaster; returns the asyncio server"""
+    return await asyncio.start_server(
+        lambda reader, writer: _handle_spectator(broadcaster, reader, writer), host, port)
@@ -0,0 +1,235 @@
+"""Command-line entry point for the Mini Cricket Head-Tail Game
+
+    python cricket_cli.py                                   # tkinter game
+    python cricket_cli.py play --tui --teams India,England  # terminal game
+    python cricket_cli.py play --bots pattern,random --matches 1000
+    python cricket_cli.py simulate --matches 100000 --teams India,England
+    python cricket_cli.py simulate --matches 1000 --log balls.log
+    python cricket_cli.py tournament --repetitions 1000
+    python cricket_cli.py serve --port 8765
+
+tkinter, asyncio and NumPy are only imported by the commands that need them,
+so headless commands start without initializing Tk or needing a display.
+"""
+import argparse
+import importlib.util
+import os
+import sys
+import time
+
+from cricket_ai import POLICIES
+from cricket_engine import NUMBERS, MatchEngine, simulate_match
+from cricket_log import BallLog
+from cricket_rng import MatchRNG
+from cricket_rosters import default_rosters
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def parse_teams(value):
+    """Split "India,England" into two known team names"""
+    teams = [team.strip() for team in value.split(",")]
+    if len(teams) != 2 or teams[0] == teams[1]:
+        raise argparse.ArgumentTypeError("give two different teams, e.g. India,England")
+    rosters = default_rosters()
+    for team in teams:
+        if team not in rosters:
+            suggestions = rosters.search(team[:3], limit=5)
+            hint = f"; did you mean {', '.join(suggestions)}?" if suggestions else ""
+            raise argparse.ArgumentTypeError(f"unknown team {team!r}{hint}")
+    return teams
+
+
+def parse_bots(value):
+    """Split "pattern,random" into two policy names"""
+    bots = [bot.strip() for bot in value.split(",")]
+    if len(bots) != 2 or any(bot not in POLICIES for bot in bots):
+        raise argparse.ArgumentTypeError(f"give two policies from {', '.join(POLICIES)}, e.g. pattern,random")
+    return bots
+
+
+def run_gui(args=None, log=None):
+    """Load cricket-game.py (and with it tkinter) and start the game
+
+    log, a BallLog, records every ball of a --bots run.
+    """
+    spec = importlib.util.spec_from_file_location("cricket_game", os.path.join(HERE, "cricket-game.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    game = module.CricketGame()
+    if args is not None and args.bots:
+        game.pacing_var.set(args.pacing)
+        rng = MatchRNG(args.seed)
+        policies = [POLICIES[bot](rng=rng) for bot in args.bots]
+        game.run_bots(*policies, matches=args.matches, render_balls=args.watch, teams=args.teams, rng=rng,
+                      listeners=[log] if log else ())
+    elif args is not None:
+        # Used by the first match started from the menu
+        game.opponent_var.set(args.opponent)
+        game.next_seed = args.seed
+    game.run()
+
+
+def ask(prompt, choices):
+    """Read one of choices from stdin; returns None at end of input"""
+    while True:
+        try:
+            answer = input(prompt).strip().lower()
+        except EOFError:
+            return None
+        if answer in choices:
+            return answer
+        print(f"Please enter one of: {', '.join(choices)}")
+
+
+def run_tui(teams, opponent, seed):
+    """Play against the computer in the terminal"""
+    rng = MatchRNG(seed)
+    computer = POLICIES[opponent](rng=rng)
+    rosters = default_rosters()
+    teams = teams or rosters.names[:2]
+    names = {"player1": teams[0], "player2": teams[1]}
+    print(f"{teams[0]} (you) vs {teams[1]} (computer)")
+
+    call = ask("Call the toss [heads/tails]: ", ["heads", "tails"])
+    if call is None:
+        return 1
+    coin = rng.coin()
+    if call == coin:
+        choice = ask(f"Coin shows {coin.upper()}. You won the toss! Bat or bowl first? [bat/bowl]: ",
+                     ["bat", "bowl"])
+        if choice is None:
+            return 1
+        batting_first = "player1" if choice == "bat" else "player2"
+    else:
+        batting_first = rng.choice(["player1", "player2"])
+        print(f"Coin shows {coin.upper()}. Computer won the toss and chose to "
+              f"{'bat' if batting_first == 'player2' else 'bowl'} first.")
+
+    engine = MatchEngine()
+    engine.start(batting_first)
+    digits = [str(n) for n in NUMBERS]
+    while not engine.finished:
+        you_bat = engine.current_batting == "player1"
+        print(f"\n{teams[0]} {engine.player1_score}/{engine.player1_wickets}  "
+              f"{teams[1]} {engine.player2_score}/{engine.player2_wickets}  "
+              f"Innings {engine.current_innings}"
+              + (f" - Target {engine.target + 1}" if engine.current_innings == 2 else ""))
+        batsman = rosters.player(names[engine.current_batting], engine.current_batsman_index)
+        print(f"Batsman: {batsman} - {engine.current_batsman_score()} runs")
+        answer = ask(f"Your {'shot' if you_bat else 'bowl'} (1-6): ", digits)
+        if answer is None:
+            return 1
+        mine = int(answer)
+        theirs = computer.choose(engine, not you_bat)
+        bat, bowl = (mine, theirs) if you_bat else (theirs, mine)
+        result = engine.play_ball(bat, bowl)
+        computer.observe(result)
+        print(f"Bat: {bat}, Bowl: {bowl} -> " + ("OUT!" if result.out else f"+{bat} runs"))
+
+        if engine.should_end_innings() and not engine.end_innings():
+            print(f"\nFirst innings complete! Target: {engine.target + 1} runs")
+
+    winner = engine.winner()
+    print(f"\n{teams[0]} {engine.player1_score}/{engine.player1_wickets}  "
+          f"{teams[1]} {engine.player2_score}/{engine.player2_wickets}")
+    print(f"{names[winner]} WINS!" if winner else "IT'S A TIE!")
+    print(f"Match seed: {rng.seed}")
+    return 0
+
+
+def run_simulate(args, log=None):
+    """Simulate many matches and print a summary; log, a BallLog, records every ball"""
+    teams = args.teams or default_rosters().names[:2]
+    if args.batch:
+        from cricket_batch import PLAYER1, PLAYER2, simulate_batch
+        result = simulate_batch(args.matches, seed=args.seed)
+        wins = [int((result.winner == PLAYER1).sum()), int((result.winner == PLAYER2).sum())]
+        averages = [int(result.player1_score.sum()) / max(args.matches, 1),
+                    int(result.player2_score.sum()) / max(args.matches, 1)]
+    else:
+        rng = MatchRNG(args.seed)
+        policy_a = POLICIES[args.policy_a](rng=rng)
+        policy_b = POLICIES[args.policy_b](rng=rng)
+        wins, totals = [0, 0], [0, 0]
+        listeners = [log] if log else ()
+        for _ in range(args.matches):
+            result = simulate_match(policy_a, policy_b, rng=rng, match_id=time.time_ns(), listeners=listeners)
+            if result.winner:
+                wins[result.winner == "player2"] += 1
+            totals[0] += result.player1_score
+            totals[1] += result.player2_score
+        averages = [total / max(args.matches, 1) for total in totals]
+
+    ties = args.matches - sum(wins)
+    for team, won, average in zip(teams, wins, averages):
+        print(f"{team:<12} wins {won:>10} ({won / max(args.matches, 1):.1%})  average score {average:.1f}")
+    print(f"{'Ties':<12}      {ties:>10} ({ties / max(args.matches, 1):.1%})")
+    return 0
+
+
+def main(argv=None):
+    """Command-line entry point: dispatch to a subcommand"""
+    parser = argparse.ArgumentParser(description="Mini Cricket Head-Tail Game")
+    commands = parser.add_subparsers(dest="command")
+
+    play = commands.add_parser("play", help="play a match (tkinter unless --tui)")
+    play.add_argument("--tui", action="store_true", help="play in the terminal")
+    play.add_argument("--teams", type=parse_teams, default=None)
+    play.add_argument("--opponent", choices=POLICIES, default="pattern")
+    play.add_argument("--seed", type=int)
+    play.add_argument("--bots", type=parse_bots, help="two policies playing each other, e.g. pattern,random")
+    play.add_argument("--matches", type=int, default=1, help="bot matches to play")
+    play.add_argument("--watch", action="store_true", help="draw every bot ball instead of only the result")
+    play.add_argument("--pacing", choices=("normal", "fast", "instant"), default="fast")
+    play.add_argument("--log", metavar="PATH", help="append every --bots ball to a ball log")
+
+    simulate = commands.add_parser("simulate", help="simulate matches headlessly")
+    simulate.add_argument("--matches", type=int, default=1000)
+    simulate.add_argument("--teams", type=parse_teams, default=None)
+    simulate.add_argument("--seed", type=int)
+    simulate.add_argument("--policy-a", choices=POLICIES, default="random")
+    simulate.add_argument("--policy-b", choices=POLICIES, default="random")
+    simulate.add_argument("--batch", action="store_true", help="vectorized simulation (needs NumPy)")
+    simulate.add_argument("--log", metavar="PATH", help="append every ball to a ball log")
+
+    commands.add_parser("tournament", help="run seeded tournaments", add_help=False)
+    commands.add_parser("serve", help="host networked matches", add_help=False)
+
+    args, rest = parser.parse_known_args(argv)
+    if args.command == "tournament":
+        import cricket_tournament
+        return cricket_tournament.main(rest)
+    if args.command == "serve":
+        import cricket_server
+        return cricket_server.main(rest)
+    if rest:
+        parser.error(f"unrecognized arguments: {' '.join(rest)}")
+
+    log_path = getattr(args, "log", None)
+    if log_path is not None:
+        if args.command == "play" and not args.bots:
+            parser.error("--log records bot matches; use it with --bots")
+        if args.command == "simulate" and args.batch:
+            parser.error("--log needs single-ball simulation; drop --batch")
+        try:
+            log = BallLog(log_path)
+        except (OSError, ValueError) as exc:
+            parser.error(str(exc))
+    else:
+        log = None
+
+    try:
+        if args.command == "simulate":
+            return run_simulate(args, log)
+        if args.command == "play" and args.tui:
+            return run_tui(args.teams, args.opponent, args.seed)
+        run_gui(args if args.command == "play" else None, log)
+        return 0
+    finally:
+        if log is not None:
+            log.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
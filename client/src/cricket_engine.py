@@ -0,0 +1,296 @@
+"""Headless rules engine for the Mini Cricket Head-Tail Game
+
+Everything that decides a ball, an innings or a match lives here so it can
+run without a display. The tkinter front end in cricket-game.py drives one
+MatchEngine per match; simulations call simulate_match directly.
+"""
+import random
+import struct
+from collections import namedtuple
+
+from cricket_rng import MatchRNG
+
+NUMBERS = (1, 2, 3, 4, 5, 6)
+TEAM_SIZE = 11
+MAX_WICKETS = 10
+
+# Outcome of a single ball, as seen by the side that was batting
+BallResult = namedtuple("BallResult", "innings batting batsman_index bat bowl out runs")
+
+# Final state of a simulated match
+MatchResult = namedtuple("MatchResult", "batting_first player1_score player2_score "
+                                        "player1_wickets player2_wickets "
+                                        "player1_individual_scores player2_individual_scores "
+                                        "winner balls")
+
+# Binary match state: version, match id, flags, innings, batsman index,
+# player1/player2 wickets, player1/player2 score, current batsman score,
+# target, balls, then player1 and player2 individual scores
+SNAPSHOT = struct.Struct("<BQBBBBBIIIII" + "I" * (2 * TEAM_SIZE))
+SNAPSHOT_VERSION = 1
+# Snapshot flag bits
+PLAYER2_BATS_FIRST = 1
+STARTED = 2
+FINISHED = 4
+ABANDONED = 8
+
+
+def other_side(side):
+    """Return the opposing side for "player1" or "player2\""""
+    return "player2" if side == "player1" else "player1"
+
+
+class MatchListener:
+    """Receives match events from a MatchEngine; override what you need"""
+
+    def on_match_start(self, engine):
+        """Called when a new match starts"""
+        pass
+
+    def on_ball(self, engine, result):
+        """Called with the BallResult of every ball"""
+        pass
+
+    def on_innings_end(self, engine):
+        """Called after each innings ends, before the match result is known"""
+        pass
+
+    def on_match_end(self, engine):
+        """Called once a match is over; engine.abandoned tells if it was cut short"""
+        pass
+
+
+class MatchEngine:
+    """Rules and scoring for one match, with no UI attached"""
+
+    __slots__ = ("listeners", "match_id", "batting_first", "current_innings",
+                 "current_batsman_index", "player1_score", "player2_score",
+                 "player1_wickets", "player2_wickets", "current_player_score",
+                 "target", "balls", "started", "finished", "abandoned",
+                 "player1_individual_scores", "player2_individual_scores")
+
+    def __init__(self, batting_first="player1", match_id=0):
+        self.listeners = []
+        self.reset(batting_first, match_id)
+
+    def reset(self, batting_first="player1", match_id=0):
+        """Reset all match state; listeners stay attached"""
+        self.match_id = match_id
+        self.batting_first = batting_first
+        self.current_innings = 1
+        self.current_batsman_index = 0
+        self.player1_score = 0
+        self.player2_score = 0
+        self.player1_wickets = 0
+        self.player2_wickets = 0
+        self.current_player_score = 0
+        self.target = 0
+        self.balls = 0
+        self.started = False
+        self.finished = False
+        self.abandoned = False
+        self.player1_individual_scores = [0] * TEAM_SIZE
+        self.player2_individual_scores = [0] * TEAM_SIZE
+
+    def start(self, batting_first="player1", match_id=0):
+        """Reset for a new match and tell the listeners it has started"""
+        self.reset(batting_first, match_id)
+        self.started = True
+        for listener in self.listeners:
+            listener.on_match_start(self)
+
+    def abandon(self):
+        """End an unfinished match without a result"""
+        if not self.started or self.finished:
+            return
+        self.finished = True
+        self.abandoned = True
+        for listener in self.listeners:
+            listener.on_match_end(self)
+
+    def snapshot(self):
+        """Pack the match state, at any ball, into SNAPSHOT.size bytes"""
+        flags = ((PLAYER2_BATS_FIRST if self.batting_first == "player2" else 0)
+                 | (STARTED if self.started else 0)
+                 | (FINISHED if self.finished else 0)
+                 | (ABANDONED if self.abandoned else 0))
+        return SNAPSHOT.pack(SNAPSHOT_VERSION, self.match_id, flags, self.current_innings,
+                             self.current_batsman_index, self.player1_wickets, self.player2_wickets,
+                             self.player1_score, self.player2_score, self.current_player_score,
+                             self.target, self.balls,
+                             *self.player1_individual_scores, *self.player2_individual_scores)
+
+    def restore(self, data):
+        """Load state from snapshot() bytes; listeners stay attached and are not told"""
+        fields = SNAPSHOT.unpack(data)
+        if fields[0] != SNAPSHOT_VERSION:
+            raise ValueError(f"unsupported snapshot version {fields[0]}")
+        (_, self.match_id, flags, self.current_innings, self.current_batsman_index,
+         self.player1_wickets, self.player2_wickets, self.player1_score, self.player2_score,
+         self.current_player_score, self.target, self.balls) = fields[:12]
+        self.batting_first = "player2" if flags & PLAYER2_BATS_FIRST else "player1"
+        self.started = bool(flags & STARTED)
+        self.finished = bool(flags & FINISHED)
+        self.abandoned = bool(flags & ABANDONED)
+        self.player1_individual_scores = list(fields[12:12 + TEAM_SIZE])
+        self.player2_individual_scores = list(fields[12 + TEAM_SIZE:])
+
+    def resume(self, data):
+        """Restore a snapshot and tell the listeners an unfinished match is under way"""
+        self.restore(data)
+        if self.started and not self.finished:
+            for listener in self.listeners:
+                listener.on_match_start(self)
+
+    @classmethod
+    def from_snapshot(cls, data):
+        """New engine, without listeners, holding a snapshot's state"""
+        engine = cls()
+        engine.restore(data)
+        return engine
+
+    @property
+    def current_batting(self):
+        """Side currently batting"""
+        if self.current_innings == 1:
+            return self.batting_first
+        return other_side(self.batting_first)
+
+    @property
+    def current_bowling(self):
+        """Side currently bowling"""
+        return other_side(self.current_batting)
+
+    def play_ball(self, bat_number, bowl_number):
+        """Resolve one ball and update the score"""
+        batting = self.current_batting
+        batsman_index = self.current_batsman_index
+        self.balls += 1
+
+        if bat_number == bowl_number:
+            # OUT!
+            if batting == "player1":
+                self.player1_wickets += 1
+            else:
+                self.player2_wickets += 1
+
+            self.current_batsman_index += 1
+            self.current_player_score = 0
+            result = BallResult(self.current_innings, batting, batsman_index,
+                                bat_number, bowl_number, True, 0)
+        else:
+            # Runs scored
+            if batting == "player1":
+                self.player1_score += bat_number
+                self.player1_individual_scores[batsman_index] += bat_number
+            else:
+                self.player2_score += bat_number
+                self.player2_individual_scores[batsman_index] += bat_number
+            self.current_player_score += bat_number
+            result = BallResult(self.current_innings, batting, batsman_index,
+                                bat_number, bowl_number, False, bat_number)
+
+        for listener in self.listeners:
+            listener.on_ball(self, result)
+        return result
+
+    def should_end_innings(self):
+        """Check if current innings should end"""
+        if self.current_batting == "player1":
+            score, wickets = self.player1_score, self.player1_wickets
+        else:
+            score, wickets = self.player2_score, self.player2_wickets
+
+        # Check wickets
+        if wickets >= MAX_WICKETS:
+            return True
+
+        # Check if target is chased in second innings
+        return self.current_innings == 2 and score > self.target
+
+    def end_innings(self):
+        """End current innings; returns True when the match is over"""
+        if self.current_innings == 1:
+            # Set target for second innings
+            if self.batting_first == "player1":
+                self.target = self.player1_score
+            else:
+                self.target = self.player2_score
+
+            self.current_innings = 2
+            self.current_batsman_index = 0
+            self.current_player_score = 0
+            for listener in self.listeners:
+                listener.on_innings_end(self)
+            return False
+
+        self.finished = True
+        for listener in self.listeners:
+            listener.on_innings_end(self)
+            listener.on_match_end(self)
+        return True
+
+    def winner(self):
+        """Return the winning side, or None for a tie"""
+        if self.player1_score > self.player2_score:
+            return "player1"
+        if self.player2_score > self.player1_score:
+            return "player2"
+        return None
+
+    def current_batsman_score(self):
+        """Runs scored so far by the batsman at the crease"""
+        if self.current_batting == "player1":
+            scores = self.player1_individual_scores
+        else:
+            scores = self.player2_individual_scores
+        return scores[min(self.current_batsman_index, TEAM_SIZE - 1)]
+
+    def result(self):
+        """Snapshot of the match as a MatchResult"""
+        return MatchResult(self.batting_first, self.player1_score, self.player2_score,
+                           self.player1_wickets, self.player2_wickets,
+                           tuple(self.player1_individual_scores),
+                           tuple(self.player2_individual_scores),
+                           self.winner(), self.balls)
+
+
+class RandomPolicy:
+    """Picks every number uniformly at random, like the original computer side"""
+
+    def __init__(self, rng=None):
+        self.rng = rng or MatchRNG()
+
+    def choose(self, engine, batting):
+        """Pick a number for the next ball"""
+        return self.rng.randint(1, 6)
+
+    def observe(self, result):
+        """Called with the BallResult of every ball"""
+        pass
+
+
+def simulate_match(policy_a, policy_b, batting_first=None, rng=None, match_id=0, listeners=()):
+    """Play a whole match between two policies and return a MatchResult
+
+    policy_a plays as player1 and policy_b as player2. When batting_first is
+    None the toss is decided with rng. listeners are attached to the engine
+    for the duration of the match.
+    """
+    if batting_first is None:
+        batting_first = (rng or random).choice(["player1", "player2"])
+
+    engine = MatchEngine()
+    engine.listeners.extend(listeners)
+    engine.start(batting_first, match_id)
+    policies = {"player1": policy_a, "player2": policy_b}
+    while not engine.finished:
+        batting = engine.current_batting
+        bat = policies[batting].choose(engine, True)
+        bowl = policies[other_side(batting)].choose(engine, False)
+        result = engine.play_ball(bat, bowl)
+        policy_a.observe(result)
+        policy_b.observe(result)
+        if engine.should_end_innings():
+            engine.end_innings()
+    return engine.result()
@@ -0,0 +1,189 @@
+"""Equilibrium bat and bowl strategies for every match state
+
+Each ball is a zero-sum game: the batter picks k and scores k runs unless
+the bowler picks the same k, which takes a wicket. If x_k is the batting
+side's value (win plus half a tie) after scoring k and y its value after a
+wicket, the batter is paid x_k - q_k (x_k - y) against bowling mix q. The
+game has a closed-form solution by water-filling: the value v solves
+sum over x_k > v of (x_k - v) / (x_k - y) = 1, the bowler plays
+q_k = (x_k - v) / (x_k - y) and the batter p_k proportional to
+1 / (x_k - y) on those numbers. Working back from the end of the match
+gives the value and both strategies for every (runs, wickets left) state of
+each innings; EquilibriumTable stores them as cumulative distributions so
+a policy draws its number with one table lookup.
+"""
+from array import array
+from functools import lru_cache
+
+from cricket_engine import MAX_WICKETS, NUMBERS
+from cricket_odds import MAX_RUNS
+from cricket_rng import MatchRNG
+
+# Value differences below this are treated as equal
+EPSILON = 1e-12
+
+
+def solve_ball(scored, out):
+    """Solve one ball given the values after scoring each number and after a wicket
+
+    Returns (value, bat probabilities, bowl probabilities) for numbers 1-6.
+    """
+    order = sorted(range(len(NUMBERS)), key=lambda i: scored[i], reverse=True)
+    value = out
+    support = 0
+    inverse_sum = weighted_sum = 0.0
+    for m, i in enumerate(order):
+        gap = scored[i] - out
+        if gap <= EPSILON:
+            break
+        inverse_sum += 1.0 / gap
+        weighted_sum += scored[i] / gap
+        candidate = (weighted_sum - 1.0) / inverse_sum
+        support = m + 1
+        value = candidate
+        if m + 1 == len(order) or candidate >= scored[order[m + 1]]:
+            break
+
+    uniform = [1.0 / len(NUMBERS)] * len(NUMBERS)
+    if support == 0:
+        # Nothing to play for: every choice leads to the same value
+        return out, uniform, uniform
+    bat = [0.0] * len(NUMBERS)
+    bowl = [0.0] * len(NUMBERS)
+    for i in order[:support]:
+        gap = scored[i] - out
+        bat[i] = 1.0 / gap / inverse_sum
+        bowl[i] = max(scored[i] - value, 0.0) / gap
+    total = sum(bowl)
+    bowl = [q / total for q in bowl]
+    return value, bat, bowl
+
+
+def _cumulative(probs, table):
+    running = 0.0
+    for p in probs[:-1]:
+        running += p
+        table.append(running)
+    table.append(1.0)
+
+
+class EquilibriumTable:
+    """Equilibrium values and strategies for every state of both innings"""
+
+    def __init__(self, max_runs=MAX_RUNS):
+        self.max_runs = max_runs
+        size = max_runs + 1
+        count = len(NUMBERS)
+        # Cumulative bat and bowl distributions, count entries per state,
+        # indexed by (wickets_left * (size + 1) + runs) for each innings
+        self.chase_bat, self.chase_bowl = array("d"), array("d")
+        self.defend_bat, self.defend_bowl = array("d"), array("d")
+        self.chase_value = self._build_chase(size, count)
+        self.defend_value = self._build_defend(size, count)
+
+    def _build_chase(self, size, count):
+        """Value of the chasing side, [wickets_left][runs_needed]"""
+        # All out: level scores are a tie, anything short is a loss
+        value = [[1.0, 0.5] + [0.0] * (size - 1)]
+        filler = [1.0 / count] * count
+        for _ in range(size + 1):
+            _cumulative(filler, self.chase_bat)
+            _cumulative(filler, self.chase_bowl)
+        for w in range(1, MAX_WICKETS + 1):
+            below = value[w - 1]
+            row = [1.0] * (size + 1)
+            _cumulative(filler, self.chase_bat)
+            _cumulative(filler, self.chase_bowl)
+            for n in range(1, size + 1):
+                scored = [row[n - run] if n > run else 1.0 for run in NUMBERS]
+                row[n], bat, bowl = solve_ball(scored, below[n])
+                _cumulative(bat, self.chase_bat)
+                _cumulative(bowl, self.chase_bowl)
+            value.append(row)
+        return value
+
+    def _build_defend(self, size, count):
+        """Value of the side batting first, [wickets_left][runs]"""
+        chase = self.chase_value[MAX_WICKETS]
+        # All out: the other side needs runs + 1 with every wicket in hand
+        value = [[1.0 - chase[min(r + 1, size)] for r in range(size + 1)]]
+        filler = [1.0 / count] * count
+        for _ in range(size + 1):
+            _cumulative(filler, self.defend_bat)
+            _cumulative(filler, self.defend_bowl)
+        for w in range(1, MAX_WICKETS + 1):
+            below = value[w - 1]
+            row = [0.0] * (size + 1)
+            strategies = [None] * (size + 1)
+            # Past the table edge extra runs no longer change the outcome
+            row[size] = below[size]
+            strategies[size] = (filler, filler)
+            for r in range(size - 1, -1, -1):
+                scored = [row[min(r + run, size)] for run in NUMBERS]
+                row[r], bat, bowl = solve_ball(scored, below[r])
+                strategies[r] = (bat, bowl)
+            for bat, bowl in strategies:
+                _cumulative(bat, self.defend_bat)
+                _cumulative(bowl, self.defend_bowl)
+            value.append(row)
+        return value
+
+    def _offset(self, innings, runs, wickets_left, target):
+        size = self.max_runs + 1
+        if innings == 1:
+            index = min(runs, size)
+        else:
+            index = min(max(target + 1 - runs, 0), size)
+        return (wickets_left * (size + 1) + index) * len(NUMBERS)
+
+    def strategies(self, innings, runs, wickets_left, target=0):
+        """Cumulative (bat, bowl) distributions for a state, as array slices"""
+        offset = self._offset(innings, runs, wickets_left, target)
+        end = offset + len(NUMBERS)
+        if innings == 1:
+            return self.defend_bat[offset:end], self.defend_bowl[offset:end]
+        return self.chase_bat[offset:end], self.chase_bowl[offset:end]
+
+    def value(self, innings, runs, wickets_left, target=0):
+        """Equilibrium win-plus-half-tie value for the side at the crease"""
+        size = self.max_runs + 1
+        if innings == 1:
+            return self.defend_value[wickets_left][min(runs, size)]
+        return self.chase_value[wickets_left][min(max(target + 1 - runs, 0), size)]
+
+
+@lru_cache(maxsize=None)
+def default_equilibrium():
+    """Shared EquilibriumTable, built on first use"""
+    return EquilibriumTable()
+
+
+class EquilibriumPolicy:
+    """Computer opponent that plays the equilibrium mix for the current state"""
+
+    def __init__(self, rng=None, table=None):
+        self.rng = rng or MatchRNG()
+        self.table = table or default_equilibrium()
+
+    def choose(self, engine, batting):
+        """Pick a number for the next ball"""
+        side = engine.current_batting
+        if side == "player1":
+            runs, wickets = engine.player1_score, engine.player1_wickets
+        else:
+            runs, wickets = engine.player2_score, engine.player2_wickets
+        table = self.table
+        offset = table._offset(engine.current_innings, runs, max(MAX_WICKETS - wickets, 0), engine.target)
+        if engine.current_innings == 1:
+            cdf = table.defend_bat if batting else table.defend_bowl
+        else:
+            cdf = table.chase_bat if batting else table.chase_bowl
+        draw = self.rng.random()
+        for number in NUMBERS:
+            if draw < cdf[offset + number - 1]:
+                return number
+        return NUMBERS[-1]
+
+    def observe(self, result):
+        """The equilibrium mix does not depend on the opponent's history"""
+        pass
@@ -0,0 +1,110 @@
+"""Compact append-only ball-by-ball event log
+
+Every ball is one fixed-size 16 byte record: match id, innings, batsman
+index, bat number, bowl number and outcome. Records are packed into an
+in-memory buffer and appended to the log file in blocks; read_balls yields
+them back lazily, one block at a time.
+"""
+import os
+import struct
+from collections import namedtuple
+
+from cricket_engine import MatchListener
+
+MAGIC = b"CRKBALL1"
+
+# match id, innings, batsman index, bat, bowl, outcome, 3 pad bytes
+RECORD = struct.Struct("<QBBBBB3x")
+
+# Outcome byte: runs scored (1-6), or OUT
+OUT = 0
+
+BallRecord = namedtuple("BallRecord", "match_id innings batsman_index bat bowl outcome")
+
+# Records buffered in memory before they are written out
+BUFFER_RECORDS = 4096
+
+
+def data_path(name):
+    """Path of a data file under DATA_DIRECTORY (default ~/.mini-cricket)"""
+    directory = os.environ.get("DATA_DIRECTORY") or os.path.join(os.path.expanduser("~"), ".mini-cricket")
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, name)
+
+
+def outcome_of(result):
+    """Outcome byte for a BallResult"""
+    return OUT if result.out else result.runs
+
+
+class BallLog(MatchListener):
+    """Buffered writer for the ball log; attach it to MatchEngine.listeners"""
+
+    def __init__(self, path, buffer_records=BUFFER_RECORDS):
+        self.path = path
+        self.file = open(path, "a+b")
+        size = self.file.tell()
+        if size == 0:
+            self.file.write(MAGIC)
+        else:
+            self.file.seek(0)
+            if self.file.read(len(MAGIC)) != MAGIC:
+                self.file.close()
+                raise ValueError(f"{path} is not a ball log")
+            # Drop a torn record left by a crash mid-write, so new records stay aligned
+            self.file.truncate(size - (size - len(MAGIC)) % RECORD.size)
+        self.buffer = bytearray(RECORD.size * buffer_records)
+        self.capacity = buffer_records
+        self.count = 0
+
+    def record(self, match_id, innings, batsman_index, bat, bowl, outcome):
+        """Append one ball to the buffer"""
+        if self.count == self.capacity:
+            self.flush()
+        RECORD.pack_into(self.buffer, self.count * RECORD.size,
+                         match_id, innings, batsman_index, bat, bowl, outcome)
+        self.count += 1
+
+    def on_ball(self, engine, result):
+        """Buffer a record for every ball the engine plays"""
+        self.record(engine.match_id, result.innings, result.batsman_index,
+                    result.bat, result.bowl, outcome_of(result))
+
+    def flush(self):
+        """Write buffered records to the file"""
+        if self.count:
+            self.file.write(memoryview(self.buffer)[:self.count * RECORD.size])
+            self.count = 0
+        self.file.flush()
+
+    def close(self):
+        """Flush and close the log file"""
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_balls(path, block_records=65536):
+    """Yield BallRecords from a log file, reading it a block at a time
+
+    A torn record at the end of the file (from a crash mid-write) is ignored;
+    BallLog trims it before appending anything else.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a ball log")
+        block_size = RECORD.size * block_records
+        while True:
+            block = f.read(block_size)
+            usable = len(block) - len(block) % RECORD.size
+            if usable:
+                for fields in RECORD.iter_unpack(memoryview(block)[:usable]):
+                    yield BallRecord._make(fields)
+            if len(block) < block_size:
+                return
@@ -0,0 +1,247 @@
+"""Low-overhead metrics for the game loop, exported in Prometheus text format
+
+Metrics are off unless CRICKET_METRICS_PORT (serve /metrics over HTTP) or
+CRICKET_METRICS_FILE (write the text format there on dump/exit) is set.
+When they are off, instrument() and attach() do nothing at all, so the hot
+path runs exactly as uninstrumented code.
+"""
+import atexit
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cricket_engine import MatchListener
+
+# Upper bounds, in seconds, shared by every latency histogram
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in sorted(labels.items())) + "}"
+
+
+class Counter:
+    """Value that only goes up"""
+
+    def __init__(self, name, help_text, labels=None):
+        self.name = name
+        self.help = help_text
+        self.labels = _labels(labels)
+        self.value = 0
+
+    def inc(self, amount=1):
+        """Add amount to the value"""
+        self.value += amount
+
+    def render(self):
+        """Sample lines in Prometheus text format"""
+        return [f"{self.name}{self.labels} {self.value}"]
+
+
+class Gauge(Counter):
+    """Value that can go up and down"""
+
+    def dec(self, amount=1):
+        """Subtract amount from the value"""
+        self.value -= amount
+
+    def set(self, value):
+        """Replace the value"""
+        self.value = value
+
+
+class Histogram:
+    """Counts of observed values per bucket, plus their sum"""
+
+    def __init__(self, name, help_text, labels=None, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.label_dict = dict(labels or {})
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        """Count one value in its bucket"""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self):
+        """Cumulative bucket, sum and count lines in Prometheus text format"""
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f"{self.name}_bucket{_labels(dict(self.label_dict, le=le))} {cumulative}")
+        labels = _labels(self.label_dict)
+        lines.append(f"{self.name}_sum{labels} {self.sum}")
+        lines.append(f"{self.name}_count{labels} {self.count}")
+        return lines
+
+
+class Registry:
+    """Holds every metric and renders them in Prometheus text format"""
+
+    def __init__(self):
+        self.metrics = {}
+        self.last_render = (time.monotonic(), 0)
+
+    def _get(self, cls, name, help_text, labels):
+        key = (name, _labels(labels))
+        metric = self.metrics.get(key)
+        if metric is None:
+            metric = self.metrics[key] = cls(name, help_text, labels)
+        return metric
+
+    def counter(self, name, help_text, labels=None):
+        """Counter with this name and labels, created on first use"""
+        return self._get(Counter, name, help_text, labels)
+
+    def gauge(self, name, help_text, labels=None):
+        """Gauge with this name and labels, created on first use"""
+        return self._get(Gauge, name, help_text, labels)
+
+    def histogram(self, name, help_text, labels=None):
+        """Histogram with this name and labels, created on first use"""
+        return self._get(Histogram, name, help_text, labels)
+
+    def render(self):
+        """Every metric in Prometheus text format"""
+        # Balls per second since the previous scrape
+        now = time.monotonic()
+        balls = self.counter("cricket_balls_total", "Balls bowled").value
+        then, balls_then = self.last_render
+        if now > then:
+            self.gauge("cricket_balls_per_second", "Balls bowled per second since the last scrape") \
+                .set(round((balls - balls_then) / (now - then), 3))
+        self.last_render = (now, balls)
+
+        lines, described = [], set()
+        kinds = {Counter: "counter", Gauge: "gauge", Histogram: "histogram"}
+        for (name, _), metric in sorted(self.metrics.items()):
+            if name not in described:
+                described.add(name)
+                lines.append(f"# HELP {name} {metric.help}")
+                lines.append(f"# TYPE {name} {kinds[type(metric)]}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+PORT = os.environ.get("CRICKET_METRICS_PORT")
+FILE = os.environ.get("CRICKET_METRICS_FILE")
+ENABLED = bool(PORT or FILE)
+
+
+def timed(func, histogram):
+    """Wrap func so every call's duration is observed in histogram"""
+    clock = time.perf_counter
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = clock()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            histogram.observe(clock() - start)
+    return wrapper
+
+
+def instrument(obj, methods):
+    """Time obj's methods, given as {method name: (metric name, labels)}
+
+    Only the instance is patched, and only when metrics are enabled.
+    """
+    if not ENABLED:
+        return
+    for method, (name, labels) in methods.items():
+        histogram = REGISTRY.histogram(name, "Seconds per call of an instrumented game method", labels)
+        setattr(obj, method, timed(getattr(obj, method), histogram))
+
+
+class MetricsListener(MatchListener):
+    """Counts balls and tracks matches in flight for a MatchEngine"""
+
+    def __init__(self, registry=REGISTRY):
+        self.balls = registry.counter("cricket_balls_total", "Balls bowled")
+        self.wickets = registry.counter("cricket_wickets_total", "Wickets taken")
+        self.in_flight = registry.gauge("cricket_matches_in_flight", "Matches currently being played")
+        self.finished = registry.counter("cricket_matches_total", "Matches finished")
+        self.abandoned = registry.counter("cricket_matches_abandoned_total", "Matches abandoned")
+
+    def on_match_start(self, engine):
+        """One more match in flight"""
+        self.in_flight.inc()
+
+    def on_ball(self, engine, result):
+        """Count the ball and any wicket"""
+        self.balls.inc()
+        if result.out:
+            self.wickets.inc()
+
+    def on_match_end(self, engine):
+        """Count the match as finished or abandoned"""
+        self.in_flight.dec()
+        if engine.abandoned:
+            self.abandoned.inc()
+        else:
+            self.finished.inc()
+
+
+def attach(engine):
+    """Add a MetricsListener to engine when metrics are enabled"""
+    if ENABLED:
+        engine.listeners.append(MetricsListener())
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serves the registry at /metrics"""
+
+    def do_GET(self):
+        """Answer a scrape"""
+        if self.path.rstrip("/") not in ("", "/metrics"):
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        """Keep scrapes out of stderr"""
+        pass
+
+
+_started = False
+
+
+def start_exporter():
+    """Start the HTTP endpoint and/or exit-time file dump, once per process"""
+    global _started
+    if not ENABLED or _started:
+        return
+    _started = True
+    if PORT:
+        server = ThreadingHTTPServer(("", int(PORT)), _Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    if FILE:
+        atexit.register(dump)
+
+
+def dump(path=None):
+    """Write the current metrics in Prometheus text format"""
+    path = path or FILE
+    with open(path + ".tmp", "w") as f:
+        f.write(REGISTRY.render())
+    os.replace(path + ".tmp", path)
@@ -0,0 +1,130 @@
+"""Exact win probabilities for any match state
+
+A match is a small Markov chain: each ball either scores the bat number or
+takes a wicket, so the state is the innings, runs, wickets left and target.
+WinProbability tabulates the recurrence once for given bat and bowl number
+distributions; every query after that is a table lookup.
+"""
+from functools import lru_cache
+
+from cricket_engine import MAX_WICKETS, NUMBERS
+
+# Runs covered by the tables; states beyond it are clamped to the edge
+MAX_RUNS = 1000
+
+
+def _normalize(probs, name):
+    if probs is None:
+        return [1.0 / len(NUMBERS)] * len(NUMBERS)
+    if len(probs) != len(NUMBERS) or min(probs) < 0 or sum(probs) <= 0:
+        raise ValueError(f"{name} must be {len(NUMBERS)} non-negative weights for numbers 1-6")
+    total = float(sum(probs))
+    return [p / total for p in probs]
+
+
+class WinProbability:
+    """Precomputed win and tie probabilities for every match state
+
+    bat_probs and bowl_probs are weights for numbers 1-6; both default to
+    uniform, which is how the computer side plays.
+    """
+
+    def __init__(self, bat_probs=None, bowl_probs=None, max_runs=MAX_RUNS):
+        bat = _normalize(bat_probs, "bat_probs")
+        bowl = _normalize(bowl_probs, "bowl_probs")
+        p_out = sum(b * k for b, k in zip(bat, bowl))
+        if p_out <= 0:
+            raise ValueError("bat and bowl distributions never produce a wicket")
+        scoring = [(run, b * (1 - k)) for run, b, k in zip(NUMBERS, bat, bowl) if b * (1 - k) > 0]
+
+        self.max_runs = max_runs
+        self.p_out = p_out
+        self._chase_win, self._chase_tie = self._build_chase(p_out, scoring, max_runs + 1)
+        self._defend_win, self._defend_tie = self._build_defend(p_out, scoring, max_runs)
+
+    @staticmethod
+    def _build_chase(p_out, scoring, size):
+        """Tables indexed [wickets_left][runs_needed] for the side batting second"""
+        win = [[1.0] + [0.0] * size]
+        tie = [[0.0] * (size + 1)]
+        tie[0][1] = 1.0  # all out one run short of the target
+        for w in range(1, MAX_WICKETS + 1):
+            below_win, below_tie = win[w - 1], tie[w - 1]
+            row_win = [1.0] * (size + 1)
+            row_tie = [0.0] * (size + 1)
+            for n in range(1, size + 1):
+                pw = p_out * below_win[n]
+                pt = p_out * below_tie[n]
+                for run, p in scoring:
+                    rest = n - run if n > run else 0
+                    pw += p * row_win[rest]
+                    pt += p * row_tie[rest]
+                row_win[n] = pw
+                row_tie[n] = pt
+            win.append(row_win)
+            tie.append(row_tie)
+        return win, tie
+
+    def _build_defend(self, p_out, scoring, size):
+        """Tables indexed [wickets_left][runs] for the side batting first"""
+        chase_win, chase_tie = self._chase_win[MAX_WICKETS], self._chase_tie[MAX_WICKETS]
+        # All out: the other side needs runs + 1 with every wicket in hand
+        win = [[1.0 - chase_win[r + 1] - chase_tie[r + 1] for r in range(size + 1)]]
+        tie = [[chase_tie[r + 1] for r in range(size + 1)]]
+        for w in range(1, MAX_WICKETS + 1):
+            below_win, below_tie = win[w - 1], tie[w - 1]
+            row_win = [0.0] * (size + 1)
+            row_tie = [0.0] * (size + 1)
+            # Past the table edge extra runs no longer change the outcome
+            row_win[size] = below_win[size]
+            row_tie[size] = below_tie[size]
+            for r in range(size - 1, -1, -1):
+                pw = p_out * below_win[r]
+                pt = p_out * below_tie[r]
+                for run, p in scoring:
+                    ahead = r + run if r + run < size else size
+                    pw += p * row_win[ahead]
+                    pt += p * row_tie[ahead]
+                row_win[r] = pw
+                row_tie[r] = pt
+            win.append(row_win)
+            tie.append(row_tie)
+        return win, tie
+
+    def chase(self, runs_needed, wickets_left):
+        """(win, tie) probabilities for the chasing side"""
+        if runs_needed <= 0:
+            return 1.0, 0.0
+        n = min(runs_needed, self.max_runs + 1)
+        return self._chase_win[wickets_left][n], self._chase_tie[wickets_left][n]
+
+    def defend(self, runs, wickets_left):
+        """(win, tie) probabilities for the side batting first"""
+        r = min(runs, self.max_runs)
+        return self._defend_win[wickets_left][r], self._defend_tie[wickets_left][r]
+
+    def batting_side(self, innings, runs, wickets_left, target=0):
+        """(win, tie) probabilities for the side at the crease"""
+        if innings == 1:
+            return self.defend(runs, wickets_left)
+        return self.chase(target + 1 - runs, wickets_left)
+
+    def for_engine(self, engine):
+        """(player1 win, player2 win, tie) probabilities for a MatchEngine"""
+        batting = engine.current_batting
+        if batting == "player1":
+            runs, wickets = engine.player1_score, engine.player1_wickets
+        else:
+            runs, wickets = engine.player2_score, engine.player2_wickets
+        win, tie = self.batting_side(engine.current_innings, runs,
+                                     max(MAX_WICKETS - wickets, 0), engine.target)
+        lose = max(1.0 - win - tie, 0.0)
+        if batting == "player1":
+            return win, lose, tie
+        return lose, win, tie
+
+
+@lru_cache(maxsize=None)
+def default_table():
+    """Shared WinProbability for uniformly random bat and bowl numbers"""
+    return WinProbability()
@@ -0,0 +1,125 @@
+"""Seekable match replays built from keyframes plus per-ball moves
+
+A Replay keeps the bat and bowl numbers of every ball and a full engine
+snapshot every KEYFRAME_INTERVAL balls. seek(ball) bisects for the last
+keyframe at or before that ball, restores it and replays the few moves in
+between, so jumping anywhere in a long innings costs O(log n) rather than a
+re-run from the first ball. ReplayRecorder builds a Replay as a MatchEngine
+plays. The game keeps only the last match's replay, in memory; save() and
+load() write and read a small binary file for tools that want to keep one.
+"""
+import os
+import struct
+from array import array
+from bisect import bisect_right
+
+from cricket_engine import SNAPSHOT, MatchEngine, MatchListener
+
+MAGIC = b"CRKRPLY1"
+
+# Balls between keyframes
+KEYFRAME_INTERVAL = 16
+
+# keyframe interval, keyframe count, move count
+HEADER = struct.Struct("<HII")
+
+
+def _settle(engine):
+    """Close an innings that the last ball ended, as the game loop would"""
+    if not engine.finished and engine.should_end_innings():
+        engine.end_innings()
+
+
+class Replay:
+    """Every position of one match, from its first recorded ball to its last"""
+
+    def __init__(self, start, interval=KEYFRAME_INTERVAL):
+        self.interval = interval
+        # Private engines: one follows the recorded moves, one is used for seeking
+        self.tail = MatchEngine.from_snapshot(start)
+        _settle(self.tail)
+        self.scratch = MatchEngine()
+        self.first_ball = self.tail.balls
+        self.keyframe_balls = array("I", [self.first_ball])
+        self.keyframes = [self.tail.snapshot()]
+        self.moves = bytearray()   # bat, bowl for each ball after first_ball
+
+    @property
+    def last_ball(self):
+        """Number of the last recorded ball"""
+        return self.first_ball + len(self.moves) // 2
+
+    def add_ball(self, bat, bowl):
+        """Append the next ball, taking a keyframe every interval balls"""
+        self.moves += bytes((bat, bowl))
+        self.tail.play_ball(bat, bowl)
+        _settle(self.tail)
+        if (self.tail.balls - self.first_ball) % self.interval == 0:
+            self.keyframe_balls.append(self.tail.balls)
+            self.keyframes.append(self.tail.snapshot())
+
+    def move(self, ball):
+        """(bat, bowl) numbers of a ball, counting from 1"""
+        offset = 2 * (ball - self.first_ball - 1)
+        return self.moves[offset], self.moves[offset + 1]
+
+    def seek(self, ball):
+        """Snapshot of the match after the given ball"""
+        ball = min(max(ball, self.first_ball), self.last_ball)
+        index = bisect_right(self.keyframe_balls, ball) - 1
+        engine = self.scratch
+        engine.restore(self.keyframes[index])
+        for number in range(self.keyframe_balls[index] + 1, ball + 1):
+            engine.play_ball(*self.move(number))
+            _settle(engine)
+        return engine.snapshot()
+
+    def save(self, path):
+        """Write the replay to path"""
+        with open(path + ".tmp", "wb") as f:
+            f.write(MAGIC)
+            f.write(HEADER.pack(self.interval, len(self.keyframes), len(self.moves) // 2))
+            f.write(self.keyframe_balls.tobytes())
+            f.write(b"".join(self.keyframes))
+            f.write(self.moves)
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, path):
+        """Read a replay written by save()"""
+        with open(path, "rb") as f:
+            data = f.read()
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a replay file")
+        interval, keyframe_count, move_count = HEADER.unpack_from(data, len(MAGIC))
+        offset = len(MAGIC) + HEADER.size
+        keyframe_balls = array("I")
+        keyframe_balls.frombytes(data[offset:offset + 4 * keyframe_count])
+        offset += 4 * keyframe_count
+        keyframes = [data[offset + i * SNAPSHOT.size:offset + (i + 1) * SNAPSHOT.size]
+                     for i in range(keyframe_count)]
+        offset += keyframe_count * SNAPSHOT.size
+
+        replay = cls(keyframes[0], interval)
+        replay.keyframe_balls = keyframe_balls
+        replay.keyframes = keyframes
+        replay.moves = bytearray(data[offset:offset + 2 * move_count])
+        replay.tail.restore(replay.seek(replay.last_ball))
+        return replay
+
+
+class ReplayRecorder(MatchListener):
+    """Records a Replay of each match a MatchEngine plays"""
+
+    def __init__(self, interval=KEYFRAME_INTERVAL):
+        self.interval = interval
+        self.replay = None
+
+    def on_match_start(self, engine):
+        """Start a new Replay from the opening position"""
+        self.replay = Replay(engine.snapshot(), self.interval)
+
+    def on_ball(self, engine, result):
+        """Add the ball to the current Replay"""
+        if self.replay is not None:
+            self.replay.add_ball(result.bat, result.bowl)
@@ -0,0 +1,55 @@
+"""Seeded per-match random numbers, drawn in blocks
+
+MatchRNG wraps its own random.Random, so a match can be replayed exactly
+from its seed, and pre-generates bat/bowl numbers a block at a time so each
+ball only pays for pulling the next value out of a buffer. It offers the
+randint/random/choice methods the game uses, so it can stand in for
+random.Random wherever a policy takes an rng.
+"""
+import random
+
+FACES = (1, 2, 3, 4, 5, 6)
+
+# Numbers 1-6 generated per refill
+BLOCK_SIZE = 1024
+
+
+def new_seed():
+    """Fresh 63-bit seed from the OS entropy source"""
+    return random.SystemRandom().getrandbits(63)
+
+
+class MatchRNG:
+    """Reproducible random source for one match"""
+
+    def __init__(self, seed=None, block_size=BLOCK_SIZE):
+        self.seed = new_seed() if seed is None else seed
+        self.block_size = block_size
+        self._random = random.Random(self.seed)
+        self._next = iter(()).__next__
+
+    def number(self):
+        """Next number from 1 to 6"""
+        try:
+            return self._next()
+        except StopIteration:
+            self._next = iter(self._random.choices(FACES, k=self.block_size)).__next__
+            return self._next()
+
+    def randint(self, a, b):
+        """Random integer from a to b inclusive, like random.randint"""
+        if a == 1 and b == 6:
+            return self.number()
+        return self._random.randint(a, b)
+
+    def random(self):
+        """Random float in [0, 1)"""
+        return self._random.random()
+
+    def choice(self, seq):
+        """Random element of a non-empty sequence"""
+        return self._random.choice(seq)
+
+    def coin(self):
+        """Toss a coin, returning heads or tails"""
+        return "heads" if self._random.random() < 0.5 else "tails"
@@ -0,0 +1,105 @@
+"""Team rosters loaded from a data file into one shared, indexed store
+
+Rosters live in rosters.json next to this file (or the file named by
+CRICKET_ROSTERS) as {"team": [11 player names], ...}. The store keeps each
+name once: team and player names are interned, squads are a flat array of
+player ids, and dicts map names back to ids. Team names are also kept in a
+sorted, lower-cased index so prefix searches over thousands of teams are a
+bisect instead of a scan. default_rosters() loads the file once per process.
+"""
+import json
+import os
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+from functools import lru_cache
+
+from cricket_engine import TEAM_SIZE
+
+ROSTERS_PATH = os.environ.get("CRICKET_ROSTERS") or \
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "rosters.json")
+
+
+class RosterStore(Mapping):
+    """Read-only mapping of team name to its squad of player names"""
+
+    def __init__(self, rosters):
+        self.names = []          # team id -> team name
+        self.team_ids = {}       # team name -> team id
+        self.players = []        # player id -> player name
+        self.player_ids = {}     # player name -> player id
+        self.squads = array("I")  # TEAM_SIZE player ids per team id
+        for name, squad in rosters.items():
+            if len(squad) != TEAM_SIZE:
+                raise ValueError(f"team {name!r} has {len(squad)} players, expected {TEAM_SIZE}")
+            if name in self.team_ids:
+                raise ValueError(f"duplicate team {name!r}")
+            name = sys.intern(name)
+            self.team_ids[name] = len(self.names)
+            self.names.append(name)
+            self.squads.extend(self._player_id(player) for player in squad)
+        # (lower-cased name, team id), sorted for prefix search
+        self.search_index = sorted((name.lower(), team_id) for team_id, name in enumerate(self.names))
+
+    @classmethod
+    def load(cls, path=ROSTERS_PATH):
+        """Read rosters from a JSON file"""
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def _player_id(self, player):
+        player_id = self.player_ids.get(player)
+        if player_id is None:
+            player_id = self.player_ids[sys.intern(player)] = len(self.players)
+            self.players.append(sys.intern(player))
+        return player_id
+
+    def squad(self, team_id):
+        """Player names of a team, by team id"""
+        start = team_id * TEAM_SIZE
+        players = self.players
+        return tuple(players[player_id] for player_id in self.squads[start:start + TEAM_SIZE])
+
+    def player(self, team, index):
+        """Name of one player, without building the whole squad"""
+        return self.players[self.squads[self.team_ids[team] * TEAM_SIZE + index]]
+
+    def __getitem__(self, team):
+        return self.squad(self.team_ids[team])
+
+    def __contains__(self, team):
+        return team in self.team_ids
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def search(self, text, limit=None):
+        """Team names starting with text, then ones containing it, case-insensitively"""
+        text = text.strip().lower()
+        if not text:
+            return self.names[:limit]
+        index = self.search_index
+        found = []
+        position = bisect_left(index, (text,))
+        while position < len(index) and index[position][0].startswith(text):
+            found.append(index[position][1])
+            position += 1
+            if limit is not None and len(found) >= limit:
+                return [self.names[team_id] for team_id in found]
+        prefixed = set(found)
+        for key, team_id in index:
+            if text in key and team_id not in prefixed:
+                found.append(team_id)
+                if limit is not None and len(found) >= limit:
+                    break
+        return [self.names[team_id] for team_id in found]
+
+
+@lru_cache(maxsize=None)
+def default_rosters():
+    """The roster store shared by everything in this process"""
+    return RosterStore.load()
@@ -0,0 +1,350 @@
+"""Asyncio server for two-human matches over the network
+
+Players connect over TCP and exchange newline-delimited JSON messages. Two
+players joining the same room (or the open lobby) are paired into a match
+played on MatchEngine; each ball waits for both sides to submit a number and
+is then resolved exactly as in the GUI.
+
+Client -> server:
+    {"type": "join", "name": "Asha", "team": "India", "room": "optional"}
+    {"type": "move", "number": 4}
+Server -> client:
+    {"type": "waiting"}
+    {"type": "start", "side": "player1", "match_id": 1, "batting_first": "player2",
+     "player1_name": ..., "player1_team": ..., "player2_name": ..., "player2_team": ...}
+    {"type": "ball", "innings": 1, "bat": 4, "bowl": 2, "out": false, "runs": 4}
+    {"type": "innings", "target": 57}
+    {"type": "end", "winner": "player1" | "player2" | null}
+    {"type": "opponent_left"}
+    {"type": "error", "message": ...}
+
+MatchClient is a small client for the tkinter game; it connects and reads on
+a background thread so the GUI can poll it from root.after. Every match is
+also published to a Broadcaster, whose spectator feed (cricket_broadcast)
+listens on its own port.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import queue
+import socket
+import threading
+
+from cricket_broadcast import DEFAULT_SPECTATOR_PORT, BroadcastListener, Broadcaster, serve_spectators
+from cricket_engine import NUMBERS, MatchEngine, other_side
+from cricket_metrics import attach as attach_metrics, start_exporter
+from cricket_rng import MatchRNG
+from cricket_rosters import default_rosters
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+def encode(message):
+    """Serialize one protocol message"""
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+class Seat:
+    """One connected player"""
+
+    def __init__(self, writer, name, team):
+        self.writer = writer
+        self.name = name
+        self.team = team
+        self.room = None
+        self.match = None
+        self.side = None
+        self.move = None
+
+    def send(self, message):
+        """Queue a message for this player unless the connection is closing"""
+        if not self.writer.is_closing():
+            self.writer.write(encode(message))
+
+
+class NetworkMatch:
+    """A match between two seats, resolved ball by ball on a MatchEngine"""
+
+    def __init__(self, match_id, seat1, seat2, batting_first, broadcaster=None):
+        self.engine = MatchEngine()
+        attach_metrics(self.engine)
+        if broadcaster is not None:
+            info = {"player1_name": seat1.name, "player1_team": seat1.team,
+                    "player2_name": seat2.name, "player2_team": seat2.team}
+            self.engine.listeners.append(BroadcastListener(broadcaster, info))
+        self.engine.start(batting_first, match_id)
+        self.seats = {"player1": seat1, "player2": seat2}
+        self.open = True
+        for side, seat in self.seats.items():
+            seat.match = self
+            seat.side = side
+
+    def start(self):
+        """Tell both players the match has started and which side they are"""
+        seat1, seat2 = self.seats["player1"], self.seats["player2"]
+        info = {"type": "start", "match_id": self.engine.match_id,
+                "batting_first": self.engine.batting_first,
+                "player1_name": seat1.name, "player1_team": seat1.team,
+                "player2_name": seat2.name, "player2_team": seat2.team}
+        for side, seat in self.seats.items():
+            seat.send(dict(info, side=side))
+
+    def broadcast(self, message):
+        """Send the same message to both players"""
+        data = encode(message)
+        for seat in self.seats.values():
+            if not seat.writer.is_closing():
+                seat.writer.write(data)
+
+    def submit(self, seat, number):
+        """Record a move; resolve the ball once both sides have moved"""
+        if self.engine.finished:
+            seat.send({"type": "error", "message": "match is over"})
+            return
+        # JSON true would otherwise pass as 1
+        if type(number) is not int or number not in NUMBERS:
+            seat.send({"type": "error", "message": "number must be 1-6"})
+            return
+        if seat.move is not None:
+            seat.send({"type": "error", "message": "already moved this ball"})
+            return
+        seat.move = number
+
+        batting = self.seats[self.engine.current_batting]
+        bowling = self.seats[self.engine.current_bowling]
+        if batting.move is None or bowling.move is None:
+            return
+        result = self.engine.play_ball(batting.move, bowling.move)
+        batting.move = bowling.move = None
+        self.broadcast({"type": "ball", "innings": result.innings, "bat": result.bat,
+                        "bowl": result.bowl, "out": result.out, "runs": result.runs})
+
+        if self.engine.should_end_innings():
+            if self.engine.end_innings():
+                self.broadcast({"type": "end", "winner": self.engine.winner()})
+            else:
+                self.broadcast({"type": "innings", "target": self.engine.target})
+
+    def leave(self, seat):
+        """A seat disconnected; returns True for the first seat to leave"""
+        if not self.engine.finished:
+            self.engine.abandon()
+            self.seats[other_side(seat.side)].send({"type": "opponent_left"})
+        first, self.open = self.open, False
+        return first
+
+
+class MatchServer:
+    """Pairs players into matches and relays their moves"""
+
+    def __init__(self, rng=None, broadcaster=None):
+        self.rng = rng or MatchRNG()
+        self.broadcaster = broadcaster or Broadcaster()
+        self.waiting = {}   # room -> Seat
+        self.matches = 0    # matches with both players still connected
+        self.match_ids = itertools.count(1)
+
+    async def handle(self, reader, writer):
+        """Serve one client connection until it closes"""
+        seat = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    writer.write(encode({"type": "error", "message": "invalid JSON"}))
+                    continue
+                if not isinstance(message, dict):
+                    writer.write(encode({"type": "error", "message": "expected a JSON object"}))
+                    continue
+                kind = message.get("type")
+                if kind == "join" and seat is None:
+                    seat = self.join(writer, message)
+                elif kind == "move" and seat is not None and seat.match is not None:
+                    seat.match.submit(seat, message.get("number"))
+                else:
+                    writer.write(encode({"type": "error", "message": f"unexpected {kind!r}"}))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            if seat is not None:
+                self.leave(seat)
+            writer.close()
+
+    def join(self, writer, message):
+        """Seat a player in a room, starting a match when the room has two"""
+        team = message.get("team")
+        if team not in default_rosters():
+            writer.write(encode({"type": "error", "message": f"unknown team {team!r}"}))
+            return None
+        seat = Seat(writer, str(message.get("name") or "Player"), team)
+        room = str(message.get("room") or "")
+        opponent = self.waiting.pop(room, None)
+        if opponent is None:
+            self.waiting[room] = seat
+            seat.room = room
+            seat.send({"type": "waiting"})
+            return seat
+
+        batting_first = self.rng.choice(["player1", "player2"])
+        match = NetworkMatch(next(self.match_ids), opponent, seat, batting_first, self.broadcaster)
+        self.matches += 1
+        match.start()
+        return seat
+
+    def leave(self, seat):
+        """Remove a disconnected player from its room or match"""
+        if seat.match is None:
+            if self.waiting.get(seat.room) is seat:
+                del self.waiting[seat.room]
+            return
+        if seat.match.leave(seat):
+            self.matches -= 1
+        seat.match = None
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, server=None):
+    """Start a MatchServer; returns the asyncio server"""
+    server = server or MatchServer()
+    return await asyncio.start_server(server.handle, host, port)
+
+
+async def run_bot(host, port, policy, team, name="Bot", room=None):
+    """Play one networked match with a policy; returns the final winner
+
+    Used for load tests and for trying the server entirely over localhost.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(encode({"type": "join", "name": name, "team": team, "room": room}))
+    engine = None
+    side = None
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                return None
+            message = json.loads(line)
+            kind = message["type"]
+            if kind == "start":
+                side = message["side"]
+                engine = MatchEngine(message["batting_first"], message["match_id"])
+            elif kind == "ball":
+                policy.observe(engine.play_ball(message["bat"], message["bowl"]))
+                if engine.should_end_innings():
+                    engine.end_innings()
+            elif kind == "end":
+                return message["winner"]
+            elif kind in ("opponent_left", "error"):
+                return None
+            else:
+                continue
+            if not engine.finished:
+                number = policy.choose(engine, engine.current_batting == side)
+                writer.write(encode({"type": "move", "number": number}))
+                await writer.drain()
+    finally:
+        writer.close()
+
+
+class MatchClient:
+    """Client for the GUI; incoming messages are queued for polling
+
+    Connecting happens on the reader thread, so the GUI never waits on an
+    unreachable host. The first message is "connected", after which join()
+    may be called, or "connect_failed" with the reason.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=5):
+        self.address = (host, port)
+        self.timeout = timeout
+        self.sock = None
+        self.closed = False
+        self.messages = queue.Queue()
+        self.reader = threading.Thread(target=self._read, daemon=True)
+        self.reader.start()
+
+    def _read(self):
+        try:
+            sock = socket.create_connection(self.address, timeout=self.timeout)
+        except OSError as exc:
+            self.messages.put({"type": "connect_failed", "message": str(exc)})
+            return
+        sock.settimeout(None)
+        self.sock = sock
+        if self.closed:
+            # close() ran while we were connecting
+            sock.close()
+            return
+        self.messages.put({"type": "connected"})
+        try:
+            for line in sock.makefile("rb"):
+                self.messages.put(json.loads(line))
+        except (OSError, ValueError):
+            pass
+        self.messages.put({"type": "disconnected"})
+
+    def send(self, message):
+        """Send one protocol message"""
+        self.sock.sendall(encode(message))
+
+    def join(self, name, team, room=None):
+        """Ask to be seated in a room (any room when None)"""
+        self.send({"type": "join", "name": name, "team": team, "room": room})
+
+    def move(self, number):
+        """Submit a number for the current ball"""
+        self.send({"type": "move", "number": number})
+
+    def poll(self):
+        """Return every message received since the last poll"""
+        messages = []
+        while True:
+            try:
+                messages.append(self.messages.get_nowait())
+            except queue.Empty:
+                return messages
+
+    def close(self):
+        """Disconnect, or give up on a connection still being made"""
+        self.closed = True
+        if self.sock is None:
+            return
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+
+def main(argv=None):
+    """Command-line entry point: run the match server and spectator feed"""
+    parser = argparse.ArgumentParser(description="Host networked cricket matches")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--spectator-port", type=int, default=DEFAULT_SPECTATOR_PORT)
+    args = parser.parse_args(argv)
+
+    async def run():
+        start_exporter()
+        match_server = MatchServer()
+        server = await serve(args.host, args.port, match_server)
+        spectators = await serve_spectators(match_server.broadcaster, args.host, args.spectator_port)
+        print(f"Cricket match server on {args.host}:{args.port}, "
+              f"spectators on {args.host}:{args.spectator_port}")
+        async with server, spectators:
+            await asyncio.gather(server.serve_forever(), spectators.serve_forever())
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
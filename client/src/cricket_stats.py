@@ -0,0 +1,153 @@
+"""Career statistics and leaderboards kept up to date one match at a time
+
+CareerStats folds every finished match into running totals: runs, innings,
+dismissals and highest score per player, and won/lost/tied per team. The
+leaderboards (best single innings and most career runs) are TopK heaps of
+at most k entries, so adding a match costs O(log k) per batsman and reading
+a leaderboard never looks back over past matches. A loss lowers a team's
+standing, which a TopK cannot follow, so teams are kept in one list sorted
+by wins then fewest losses and updated with bisect. The totals are saved as a
+small JSON file whose size depends on the number of players, not matches.
+"""
+import heapq
+import json
+import os
+from bisect import bisect_left, insort
+
+from cricket_engine import MAX_WICKETS
+
+# Entries kept on each leaderboard
+LEADERBOARD_SIZE = 10
+
+
+class TopK:
+    """The k largest values by key, for values that only ever grow"""
+
+    def __init__(self, k=LEADERBOARD_SIZE):
+        self.k = k
+        self.members = {}   # key -> value, for keys on the board
+        self.heap = []      # (value, key); entries whose value is out of date are stale
+
+    def _pop_stale(self):
+        heap = self.heap
+        while heap and self.members.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+
+    def update(self, key, value):
+        """Offer a key's new value"""
+        members = self.members
+        if key in members:
+            members[key] = value
+        elif len(members) < self.k:
+            members[key] = value
+        else:
+            self._pop_stale()
+            if value <= self.heap[0][0]:
+                return
+            del members[heapq.heappop(self.heap)[1]]
+            members[key] = value
+        heapq.heappush(self.heap, (value, key))
+        if len(self.heap) > 2 * self.k:
+            # Drop stale entries before they pile up
+            self.heap = [(value, key) for key, value in members.items()]
+            heapq.heapify(self.heap)
+
+    def items(self):
+        """(key, value) pairs, largest value first"""
+        return sorted(self.members.items(), key=lambda item: (-item[1], item[0]))
+
+
+class CareerStats:
+    """Running player and team statistics over every finished match"""
+
+    def __init__(self, path=None, k=LEADERBOARD_SIZE):
+        self.path = path
+        self.players = {}   # (team, player) -> [innings, outs, runs, highest]
+        self.teams = {}     # team -> [won, lost, tied]
+        self.team_ranks = []    # (-won, lost, team) for every team, best first
+        self.k = k
+        self.matches = 0
+        self.top_innings = TopK(k)   # (player, team, match id) -> runs
+        self.top_runs = TopK(k)      # (player, team) -> career runs
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self._load(json.load(f))
+
+    def _load(self, state):
+        self.matches = state["matches"]
+        for team, player, *row in state["players"]:
+            self.players[team, player] = row
+            self.top_runs.update((player, team), row[2])
+        for team, *row in state["teams"]:
+            self.teams[team] = row
+        self.team_ranks = sorted((-won, lost, team) for team, (won, lost, _) in self.teams.items())
+        for player, team, match_id, runs in state["top_innings"]:
+            self.top_innings.update((player, team, match_id), runs)
+
+    def add_match(self, match_id, team1, team2, result, rosters):
+        """Fold one finished MatchResult into the totals"""
+        self.matches += 1
+        winner = result.winner
+        for side, team, scores, wickets in (
+                ("player1", team1, result.player1_individual_scores, result.player1_wickets),
+                ("player2", team2, result.player2_individual_scores, result.player2_wickets)):
+            record = self.teams.get(team)
+            if record is None:
+                record = self.teams[team] = [0, 0, 0]
+            else:
+                del self.team_ranks[bisect_left(self.team_ranks, (-record[0], record[1], team))]
+            record[2 if winner is None else 0 if winner == side else 1] += 1
+            insort(self.team_ranks, (-record[0], record[1], team))
+
+            # Batsmen 0..wickets went in; all but the last were out, and the
+            # last is out too when the side was bowled out
+            squad = rosters[team]
+            batted = min(wickets + 1, MAX_WICKETS)
+            for index in range(batted):
+                runs = scores[index]
+                out = index < wickets
+                row = self.players.setdefault((team, squad[index]), [0, 0, 0, 0])
+                row[0] += 1
+                row[1] += out
+                row[2] += runs
+                row[3] = max(row[3], runs)
+                self.top_runs.update((squad[index], team), row[2])
+                self.top_innings.update((squad[index], team, match_id), runs)
+
+    def batting(self, team, player):
+        """(innings, outs, runs, highest, average) for a player; average is None until out"""
+        innings, outs, runs, highest = self.players.get((team, player), (0, 0, 0, 0))
+        return innings, outs, runs, highest, runs / outs if outs else None
+
+    def team_record(self, team):
+        """(won, lost, tied) for a team"""
+        return tuple(self.teams.get(team, (0, 0, 0)))
+
+    def team_leaderboard(self):
+        """Most wins, then fewest losses: (team, won, lost, tied), best first"""
+        return [(team, -won, lost, self.teams[team][2]) for won, lost, team in self.team_ranks[:self.k]]
+
+    def leaderboard(self):
+        """Most career runs: (player, team, runs, average), best first"""
+        board = []
+        for (player, team), runs in self.top_runs.items():
+            average = self.batting(team, player)[4]
+            board.append((player, team, runs, average))
+        return board
+
+    def best_innings(self):
+        """Highest single innings: (player, team, match id, runs), best first"""
+        return [(player, team, match_id, runs)
+                for (player, team, match_id), runs in self.top_innings.items()]
+
+    def save(self):
+        """Write the totals to the stats file"""
+        state = {
+            "matches": self.matches,
+            "players": [[team, player, *row] for (team, player), row in self.players.items()],
+            "teams": [[team, *row] for team, row in self.teams.items()],
+            "top_innings": [[*key, runs] for key, runs in self.top_innings.items()],
+        }
+        with open(self.path + ".tmp", "w") as f:
+            json.dump(state, f)
+        os.replace(self.path + ".tmp", self.path)
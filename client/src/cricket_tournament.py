@@ -0,0 +1,144 @@
+"""Round-robin plus knockout tournaments spread across worker processes
+
+Every repetition plays each pairing of teams once, then the top four meet in
+semi-finals (top two in a final when fewer teams enter). Repetitions are
+split into blocks and run on a ProcessPoolExecutor; each repetition draws
+from its own MatchRNG stream seeded from (seed, repetition), so results do
+not depend on how the blocks land on workers.
+"""
+import argparse
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+from cricket_engine import RandomPolicy, simulate_match
+from cricket_rng import MatchRNG
+from cricket_rosters import default_rosters
+
+POINTS_WIN = 2
+POINTS_TIE = 1
+STANDING_FIELDS = ("played", "won", "lost", "tied", "points",
+                   "runs_for", "runs_against", "semis", "finals", "titles")
+
+
+def repetition_rng(seed, repetition):
+    """Independent RNG stream for one tournament repetition"""
+    return MatchRNG(f"{seed}:{repetition}")
+
+
+def _play(team_a, team_b, rng):
+    """Play one match; returns (winner or None, runs for team_a, runs for team_b)"""
+    policy = RandomPolicy(rng)
+    result = simulate_match(policy, policy, rng=rng)
+    if result.winner == "player1":
+        winner = team_a
+    elif result.winner == "player2":
+        winner = team_b
+    else:
+        winner = None
+    return winner, result.player1_score, result.player2_score
+
+
+def _play_knockout(team_a, team_b, rng):
+    """Knockout matches are replayed until there is a winner"""
+    while True:
+        winner, _, _ = _play(team_a, team_b, rng)
+        if winner is not None:
+            return winner
+
+
+def play_tournament(teams, rng):
+    """Play one round-robin plus knockout; returns {team: Counter} standings"""
+    standings = {team: Counter() for team in teams}
+
+    for team_a, team_b in combinations(teams, 2):
+        winner, runs_a, runs_b = _play(team_a, team_b, rng)
+        for team, runs_for, runs_against in ((team_a, runs_a, runs_b), (team_b, runs_b, runs_a)):
+            row = standings[team]
+            row["played"] += 1
+            row["runs_for"] += runs_for
+            row["runs_against"] += runs_against
+            if winner is None:
+                row["tied"] += 1
+                row["points"] += POINTS_TIE
+            elif winner == team:
+                row["won"] += 1
+                row["points"] += POINTS_WIN
+            else:
+                row["lost"] += 1
+
+    table = sorted(teams, key=lambda t: (standings[t]["points"],
+                                         standings[t]["runs_for"] - standings[t]["runs_against"],
+                                         rng.random()), reverse=True)
+    if len(table) >= 4:
+        for team in table[:4]:
+            standings[team]["semis"] += 1
+        finalists = [_play_knockout(table[0], table[3], rng),
+                     _play_knockout(table[1], table[2], rng)]
+    else:
+        finalists = table[:2]
+
+    if len(finalists) == 2:
+        for team in finalists:
+            standings[team]["finals"] += 1
+        standings[_play_knockout(finalists[0], finalists[1], rng)]["titles"] += 1
+    return standings
+
+
+def _run_block(teams, seed, start, count):
+    """Worker entry point: play repetitions [start, start + count) and merge them"""
+    totals = {team: Counter() for team in teams}
+    for repetition in range(start, start + count):
+        for team, row in play_tournament(teams, repetition_rng(seed, repetition)).items():
+            totals[team].update(row)
+    return totals
+
+
+def run_tournaments(repetitions, teams=None, seed=0, workers=None, block_size=None):
+    """Play many seeded tournaments in parallel and return merged standings"""
+    teams = list(teams or default_rosters())
+    if len(teams) < 2:
+        raise ValueError("a tournament needs at least two teams")
+    workers = workers or os.cpu_count() or 1
+    if block_size is None:
+        # A few blocks per worker keeps them all busy without much IPC
+        block_size = max(1, -(-repetitions // (workers * 4)))
+
+    standings = {team: Counter() for team in teams}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_run_block, teams, seed, start, min(block_size, repetitions - start))
+                   for start in range(0, repetitions, block_size)]
+        for future in futures:
+            for team, row in future.result().items():
+                standings[team].update(row)
+    return standings
+
+
+def format_standings(standings):
+    """Render merged standings as a text table, best team first"""
+    order = sorted(standings, key=lambda t: (standings[t]["titles"], standings[t]["points"]),
+                   reverse=True)
+    width = max(len(team) for team in order)
+    lines = [f"{'Team':<{width}} " + " ".join(f"{field:>12}" for field in STANDING_FIELDS)]
+    for team in order:
+        row = standings[team]
+        lines.append(f"{team:<{width}} " + " ".join(f"{row[field]:>12}" for field in STANDING_FIELDS))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Command-line entry point: run a tournament and print the table"""
+    parser = argparse.ArgumentParser(description="Run seeded cricket tournaments in parallel")
+    parser.add_argument("--repetitions", type=int, default=1000)
+    parser.add_argument("--teams", help="comma-separated team names (default: all)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    teams = args.teams.split(",") if args.teams else None
+    print(format_standings(run_tournaments(args.repetitions, teams, args.seed, args.workers)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import random
+
+import pytest
+
+from cricket_archive import BATTING_FIRST_WON, CHASE_WON, MAGIC, MATCH, TIE, MatchArchive
+from cricket_engine import RandomPolicy, simulate_match
+from cricket_rosters import default_rosters
+
+
+def play(count, seed=1):
+    """(match id, team1, team2, result) for count random matches"""
+    rng = random.Random(seed)
+    teams = list(default_rosters())
+    matches = []
+    for match_id in range(1, count + 1):
+        team1, team2 = rng.sample(teams, 2)
+        result = simulate_match(RandomPolicy(rng), RandomPolicy(rng), rng=rng)
+        matches.append((match_id, team1, team2, result))
+    return matches
+
+
+def check_queries(archive, matches, rosters):
+    for team in rosters:
+        played = [(t1, r) for _, t1, t2, r in matches if team in (t1, t2)]
+        wins = sum(r.winner == ("player1" if t1 == team else "player2") for t1, r in played)
+        assert archive.win_rate(team) == (wins, len(played))
+
+    batsman = rosters["India"][0]
+    runs = sum(r.player1_individual_scores[0] if t1 == "India" else r.player2_individual_scores[0]
+               for _, t1, t2, r in matches if "India" in (t1, t2))
+    assert archive.career_runs(batsman) == runs
+
+    best = max(score for *_, r in matches
+               for score in r.player1_individual_scores + r.player2_individual_scores)
+    assert archive.top_scores(1)[0][0] == best
+
+    outcomes = {BATTING_FIRST_WON: [], CHASE_WON: [], TIE: []}
+    for match_id, _, _, r in matches:
+        if r.winner is None:
+            outcomes[TIE].append(match_id)
+        elif r.winner == r.batting_first:
+            outcomes[BATTING_FIRST_WON].append(match_id)
+        else:
+            outcomes[CHASE_WON].append(match_id)
+    for outcome, ids in outcomes.items():
+        assert archive.match_ids(outcome) == ids
+
+
+def test_queries_match_the_played_matches_before_and_after_reopening(tmp_path):
+    path = str(tmp_path / "matches.arc")
+    rosters = default_rosters()
+    matches = play(200)
+    archive = MatchArchive(path)
+    for match in matches[:150]:
+        archive.add_match(*match, rosters)
+    archive.flush()
+    check_queries(archive, matches[:150], rosters)
+    archive.close()
+
+    archive = MatchArchive(path)
+    assert archive.count == 150
+    for match in matches[150:]:
+        archive.add_match(*match, rosters)
+    check_queries(archive, matches, rosters)
+    archive.close()
+    assert (tmp_path / "matches.arc").stat().st_size == len(MAGIC) + 200 * MATCH.size
+
+
+def test_torn_record_is_dropped_on_open(tmp_path):
+    path = str(tmp_path / "matches.arc")
+    rosters = default_rosters()
+    matches = play(3, seed=2)
+    archive = MatchArchive(path)
+    for match in matches[:2]:
+        archive.add_match(*match, rosters)
+    archive.close()
+    with open(path, "ab") as f:
+        f.write(b"\1" * (MATCH.size // 2))
+
+    archive = MatchArchive(path)
+    assert archive.count == 2
+    archive.add_match(*matches[2], rosters)
+    check_queries(archive, matches, rosters)
+    archive.close()
+
+
+def test_other_files_are_refused_and_left_alone(tmp_path):
+    path = tmp_path / "matches.arc"
+    foreign = b"not an archive " * 10
+    path.write_bytes(foreign)
+    with pytest.raises(ValueError):
+        MatchArchive(str(path))
+    assert path.read_bytes() == foreign
+
+
+def test_header_cut_short_is_rewritten(tmp_path):
+    path = tmp_path / "matches.arc"
+    path.write_bytes(MAGIC[:3])
+    archive = MatchArchive(str(path))
+    assert archive.count == 0
+    archive.add_match(*play(1)[0], default_rosters())
+    archive.close()
+    assert path.stat().st_size == len(MAGIC) + MATCH.size
+
+
+def test_writing_does_not_build_indexes(tmp_path):
+    path = str(tmp_path / "matches.arc")
+    rosters = default_rosters()
+    matches = play(20, seed=3)
+    archive = MatchArchive(path)
+    for match in matches[:10]:
+        archive.add_match(*match, rosters)
+    archive.close()
+
+    archive = MatchArchive(path)
+    for match in matches[10:]:
+        archive.add_match(*match, rosters)
+    assert not archive.indexed and archive.by_team == {}
+    check_queries(archive, matches, rosters)
+    assert archive.indexed
+    archive.close()
@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from cricket_engine import RandomPolicy, simulate_match
+from cricket_log import MAGIC, OUT, RECORD, BallLog, BallRecord, read_balls
+
+
+def test_records_round_trip_across_buffer_flushes(tmp_path):
+    path = str(tmp_path / "balls.log")
+    records = [BallRecord(n, 1 + n % 2, n % 11, 1 + n % 6, 1 + n * 7 % 6, n % 7) for n in range(1000)]
+    with BallLog(path, buffer_records=64) as log:
+        for record in records:
+            log.record(*record)
+    assert list(read_balls(path, block_records=100)) == records
+
+
+def test_log_listens_to_an_engine(tmp_path):
+    path = str(tmp_path / "balls.log")
+    with BallLog(path) as log:
+        result = simulate_match(RandomPolicy(random.Random(1)), RandomPolicy(random.Random(2)),
+                                rng=random.Random(3), match_id=42, listeners=[log])
+    balls = list(read_balls(path))
+    assert len(balls) == result.balls
+    assert {ball.match_id for ball in balls} == {42}
+    assert sum(ball.outcome for ball in balls) == result.player1_score + result.player2_score
+    assert sum(ball.outcome == OUT for ball in balls) == result.player1_wickets + result.player2_wickets
+
+
+def test_torn_record_is_trimmed_before_appending(tmp_path):
+    path = str(tmp_path / "balls.log")
+    first = BallRecord(1, 1, 0, 3, 4, 3)
+    second = BallRecord(2, 2, 1, 5, 5, OUT)
+    with BallLog(path) as log:
+        log.record(*first)
+    with open(path, "ab") as f:
+        f.write(b"xyz")
+    with BallLog(path) as log:
+        log.record(*second)
+    assert list(read_balls(path)) == [first, second]
+    assert (tmp_path / "balls.log").stat().st_size == len(MAGIC) + 2 * RECORD.size
+
+
+def test_other_files_are_refused(tmp_path):
+    path = str(tmp_path / "other.bin")
+    with open(path, "wb") as f:
+        f.write(b"not a ball log at all")
+    with pytest.raises(ValueError):
+        BallLog(path)
+    with pytest.raises(ValueError):
+        list(read_balls(path))
@@ -0,0 +1,73 @@
+import random
+
+import pytest
+
+from cricket_engine import MAX_WICKETS, RandomPolicy, simulate_match
+
+np = pytest.importorskip("numpy")
+from cricket_batch import PLAYER1, PLAYER2, TIE, simulate_batch  # noqa: E402
+
+
+def innings(result):
+    """(first innings score, chasing score, chasing wickets) arrays"""
+    first = result.player1_bats_first
+    return (np.where(first, result.player1_score, result.player2_score),
+            np.where(first, result.player2_score, result.player1_score),
+            np.where(first, result.player2_wickets, result.player1_wickets))
+
+
+def test_batsmen_add_up_to_team_scores():
+    result = simulate_batch(5000, seed=1)
+    assert (result.player1_individual_scores.sum(axis=1) == result.player1_score).all()
+    assert (result.player2_individual_scores.sum(axis=1) == result.player2_score).all()
+    assert (result.player1_wickets <= MAX_WICKETS).all()
+    assert (result.player2_wickets <= MAX_WICKETS).all()
+
+
+def test_chase_stops_past_the_target_or_all_out():
+    result = simulate_batch(5000, seed=2)
+    target, chase, chase_wickets = innings(result)
+    passed = chase > target
+    assert (passed | (chase_wickets == MAX_WICKETS)).all()
+    assert (chase[passed] <= target[passed] + 6).all()
+    # The side batting first is always bowled out
+    first_wickets = np.where(result.player1_bats_first, result.player1_wickets, result.player2_wickets)
+    assert (first_wickets == MAX_WICKETS).all()
+
+    expected = np.where(result.player1_score > result.player2_score, PLAYER1,
+                        np.where(result.player2_score > result.player1_score, PLAYER2, TIE))
+    assert (result.winner == expected).all()
+
+
+@pytest.mark.parametrize("n", [0, 7, 25])
+def test_chunks_concatenate_to_the_usual_shapes(n):
+    reference = simulate_batch(3, seed=3)
+    result = simulate_batch(n, seed=3, chunk=10)
+    for field, base in zip(result, reference):
+        assert field.shape[1:] == base.shape[1:]
+        assert field.shape[0] == n
+        assert field.dtype == base.dtype
+
+
+def test_fixed_batting_order():
+    assert simulate_batch(50, seed=4, batting_first="player2").player1_bats_first.sum() == 0
+    assert simulate_batch(50, seed=4, batting_first="player1").player1_bats_first.all()
+
+
+def test_statistics_agree_with_simulate_match():
+    batch = simulate_batch(40_000, seed=5)
+    rng = random.Random(6)
+    policy = RandomPolicy(rng)
+    single = [simulate_match(policy, policy, rng=rng) for _ in range(3000)]
+
+    batch_mean = float((batch.player1_score + batch.player2_score).mean()) / 2
+    single_mean = sum(r.player1_score + r.player2_score for r in single) / (2 * len(single))
+    assert batch_mean == pytest.approx(single_mean, rel=0.03)
+
+    batch_balls = float(batch.balls.mean())
+    single_balls = sum(r.balls for r in single) / len(single)
+    assert batch_balls == pytest.approx(single_balls, rel=0.03)
+
+    batch_ties = float((batch.winner == TIE).mean())
+    single_ties = sum(r.winner is None for r in single) / len(single)
+    assert abs(batch_ties - single_ties) < 0.006
@@ -0,0 +1,200 @@
+import asyncio
+import json
+import random
+
+from cricket_broadcast import Broadcaster, BroadcastListener, scoreboard, serve_spectators
+from cricket_engine import MatchEngine
+from cricket_server import MatchServer, encode, serve
+
+
+class Follower:
+    """Rebuilds the score from a spectator stream, as a client would"""
+
+    def __init__(self):
+        self.seq = None
+        self.score = None
+        self.winner = None
+        self.ended = False
+        self.syncs = 0
+
+    def feed(self, data):
+        for line in data.splitlines():
+            message = json.loads(line)
+            if message["type"] == "sync":
+                self.syncs += 1
+                state = message["state"]
+                self.score = {"player1": list(state["player1"]), "player2": list(state["player2"])}
+            else:
+                assert message["seq"] == self.seq + 1
+                if message["type"] == "ball":
+                    runs_wickets = self.score[message["side"]]
+                    if message["out"]:
+                        runs_wickets[1] += 1
+                    else:
+                        runs_wickets[0] += message["bat"]
+                elif message["type"] == "end":
+                    self.ended = True
+                    self.winner = message["winner"]
+            self.seq = message["seq"]
+
+
+async def follow(subscriber):
+    follower = Follower()
+    while (data := await subscriber.get()) is not None:
+        follower.feed(data)
+    return follower
+
+
+async def play(engine, rng):
+    while not engine.finished:
+        engine.play_ball(rng.randint(1, 6), rng.randint(1, 6))
+        if engine.should_end_innings():
+            engine.end_innings()
+        # Let subscribers run between balls, as they would between network moves
+        await asyncio.sleep(0)
+
+
+def final_score(engine):
+    return {"player1": [engine.player1_score, engine.player1_wickets],
+            "player2": [engine.player2_score, engine.player2_wickets]}
+
+
+def test_every_in_process_subscriber_sees_the_final_score():
+    async def main():
+        broadcaster = Broadcaster()
+        engine = MatchEngine()
+        engine.listeners.append(BroadcastListener(broadcaster, {"player1_team": "India"}))
+        engine.start("player1", 5)
+        assert broadcaster.live_matches() == [{"player1_team": "India", "match_id": 5}]
+        tasks = [asyncio.create_task(follow(broadcaster.subscribe(5))) for _ in range(500)]
+        await asyncio.sleep(0)
+        await play(engine, random.Random(1))
+        followers = await asyncio.gather(*tasks)
+        return broadcaster, engine, followers
+
+    broadcaster, engine, followers = asyncio.run(main())
+    assert broadcaster.channels == {}
+    for follower in followers:
+        assert follower.ended and follower.syncs == 1
+        assert follower.score == final_score(engine)
+        assert follower.winner == engine.winner()
+
+
+def test_slow_subscriber_is_resynced_to_the_latest_score():
+    async def main():
+        broadcaster = Broadcaster(limit=4)
+        engine = MatchEngine()
+        engine.listeners.append(BroadcastListener(broadcaster))
+        engine.start("player1", 1)
+        slow = broadcaster.subscribe(1)
+        follower = Follower()
+        follower.feed(await slow.get())
+        for _ in range(3):
+            engine.play_ball(2, 1)
+        # Within the window: the missed deltas arrive together
+        follower.feed(await slow.get())
+        assert slow.dropped == 0
+        for _ in range(10):
+            engine.play_ball(3, 1)
+        data = await slow.get()
+        follower.feed(data)
+        assert json.loads(data)["type"] == "sync"
+        assert slow.dropped == 10
+        assert follower.score == final_score(engine)
+        assert len(broadcaster.channels[1].backlog) == 4
+        engine.abandon()
+        data = await slow.get()
+        follower.feed(data)
+        assert await slow.get() is None
+        return follower
+
+    follower = asyncio.run(main())
+    assert follower.ended and follower.winner is None and follower.syncs == 2
+
+
+def test_spectator_feed_follows_a_server_match_over_localhost():
+    async def main():
+        match_server = MatchServer(random.Random(3))
+        server = await serve("127.0.0.1", 0, match_server)
+        spectators = await serve_spectators(match_server.broadcaster, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        spectator_port = spectators.sockets[0].getsockname()[1]
+
+        players = [await asyncio.open_connection("127.0.0.1", port) for _ in range(2)]
+        for (_, writer), team in zip(players, ["India", "England"]):
+            writer.write(encode({"type": "join", "team": team}))
+        for player_reader, _ in players:
+            while (start := json.loads(await player_reader.readline()))["type"] != "start":
+                pass
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", spectator_port)
+        writer.write(encode({"type": "list"}))
+        matches = json.loads(await reader.readline())["matches"]
+        writer.close()
+        assert [(m["player1_team"], m["player2_team"]) for m in matches] == [("India", "England")]
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", spectator_port)
+        writer.write(encode({"type": "watch", "match_id": matches[0]["match_id"]}))
+        follower = Follower()
+        follower.feed(await reader.readline())
+
+        # Mirror the match locally to know when it is over
+        engine = MatchEngine(start["batting_first"])
+        rng = random.Random(4)
+        while not engine.finished:
+            for _, player in players:
+                player.write(encode({"type": "move", "number": rng.randint(1, 6)}))
+            for player_reader, _ in players:
+                while (ball := json.loads(await player_reader.readline()))["type"] != "ball":
+                    pass
+            engine.play_ball(ball["bat"], ball["bowl"])
+            if engine.should_end_innings():
+                engine.end_innings()
+        while (result := json.loads(await players[0][0].readline()))["type"] != "end":
+            pass
+        follower.feed(await asyncio.wait_for(reader.read(), 5))
+        for _, player in players:
+            player.close()
+        writer.close()
+        await asyncio.sleep(0.05)
+        server.close()
+        spectators.close()
+        return follower, result, engine, match_server.broadcaster
+
+    follower, result, engine, broadcaster = asyncio.run(main())
+    assert follower.ended and follower.syncs == 1
+    assert follower.score == final_score(engine)
+    assert follower.winner == result["winner"] == engine.winner()
+    assert broadcaster.channels == {}
+
+
+def test_bad_spectator_requests_get_error_replies():
+    async def main():
+        spectators = await serve_spectators(Broadcaster(), "127.0.0.1", 0)
+        port = spectators.sockets[0].getsockname()[1]
+        replies = []
+        for line in [b"[1]\n", b"not json\n", b'{"type": "watch", "match_id": 99}\n',
+                     b'{"type": "shout"}\n']:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(line)
+            replies.append(json.loads(await reader.readline()))
+            writer.close()
+        await asyncio.sleep(0.05)
+        spectators.close()
+        return replies
+
+    replies = asyncio.run(main())
+    assert [reply["type"] for reply in replies] == ["error"] * 4
+    assert replies[0]["message"] == replies[1]["message"] == "expected a JSON object"
+    assert replies[2]["message"] == "no such live match"
+
+
+def test_scoreboard_reports_the_winner_only_when_finished():
+    engine = MatchEngine()
+    engine.start("player1", 3)
+    assert scoreboard(engine)["winner"] is None
+    engine.play_ball(6, 1)
+    engine.abandon()
+    state = scoreboard(engine, {"player1_name": "A"})
+    assert state["player1"] == [6, 0] and state["finished"] and state["winner"] is None
+    assert state["player1_name"] == "A"
@@ -0,0 +1,99 @@
+import random
+
+from cricket_engine import MAX_WICKETS, MatchEngine, MatchListener, RandomPolicy, simulate_match
+
+
+class Recorder(MatchListener):
+    def __init__(self):
+        self.events = []
+
+    def on_match_start(self, engine):
+        self.events.append("start")
+
+    def on_ball(self, engine, result):
+        self.events.append("ball")
+
+    def on_innings_end(self, engine):
+        self.events.append("innings")
+
+    def on_match_end(self, engine):
+        self.events.append("end")
+
+
+def test_runs_and_wickets():
+    engine = MatchEngine()
+    engine.start("player1")
+    result = engine.play_ball(4, 2)
+    assert (result.runs, result.out) == (4, False)
+    assert engine.player1_score == 4
+    assert engine.player1_individual_scores[0] == 4
+    result = engine.play_ball(3, 3)
+    assert result.out
+    assert engine.player1_wickets == 1
+    assert engine.current_batsman_index == 1
+    assert engine.current_player_score == 0
+
+
+def test_innings_ends_after_all_wickets_and_sets_target():
+    engine = MatchEngine()
+    engine.start("player2")
+    engine.play_ball(6, 1)
+    for _ in range(MAX_WICKETS):
+        assert not engine.should_end_innings()
+        engine.play_ball(2, 2)
+    assert engine.should_end_innings()
+    assert not engine.end_innings()
+    assert engine.target == 6
+    assert engine.current_batting == "player1"
+
+
+def test_chase_ends_once_target_passed():
+    engine = MatchEngine()
+    engine.start("player1")
+    engine.play_ball(5, 1)
+    for _ in range(MAX_WICKETS):
+        engine.play_ball(1, 1)
+    engine.end_innings()
+    engine.play_ball(5, 1)
+    assert not engine.should_end_innings()
+    engine.play_ball(1, 2)
+    assert engine.should_end_innings()
+    assert engine.end_innings()
+    assert engine.finished
+    assert engine.winner() == "player2"
+
+
+def test_listeners_see_every_event_in_order():
+    recorder = Recorder()
+    result = simulate_match(RandomPolicy(random.Random(1)), RandomPolicy(random.Random(2)),
+                            batting_first="player1", listeners=[recorder])
+    assert recorder.events[0] == "start"
+    assert recorder.events.count("ball") == result.balls
+    assert recorder.events.count("innings") == 2
+    assert recorder.events[-1] == "end"
+
+
+def test_simulated_match_is_consistent_and_reproducible():
+    results = [simulate_match(RandomPolicy(random.Random(7)), RandomPolicy(random.Random(8)),
+                              rng=random.Random(9)) for _ in range(2)]
+    assert results[0] == results[1]
+    result = results[0]
+    assert sum(result.player1_individual_scores) == result.player1_score
+    assert sum(result.player2_individual_scores) == result.player2_score
+    if result.player1_score != result.player2_score:
+        assert result.winner == ("player1" if result.player1_score > result.player2_score else "player2")
+    else:
+        assert result.winner is None
+
+
+def test_abandon_ends_a_live_match_once():
+    recorder = Recorder()
+    engine = MatchEngine()
+    engine.listeners.append(recorder)
+    engine.abandon()
+    assert recorder.events == []
+    engine.start()
+    engine.abandon()
+    engine.abandon()
+    assert engine.finished and engine.abandoned
+    assert recorder.events == ["start", "end"]
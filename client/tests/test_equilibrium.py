@@ -0,0 +1,90 @@
+import random
+
+import pytest
+
+from cricket_engine import MAX_WICKETS, NUMBERS, RandomPolicy, simulate_match
+from cricket_equilibrium import EquilibriumPolicy, EquilibriumTable, solve_ball
+from cricket_rng import MatchRNG
+
+TOLERANCE = 1e-12
+
+
+def random_ball(rng):
+    scored = [rng.random() for _ in NUMBERS]
+    if rng.random() < 0.3:
+        # Repeated values, as at the end of a chase
+        scored[rng.randrange(len(NUMBERS))] = scored[0]
+    out = min(scored) * rng.random() if rng.random() < 0.9 else min(scored)
+    return scored, out
+
+
+def payoff(scored, out, bat, bowl):
+    return out if bat == bowl else scored[bat]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_solve_ball_is_an_equilibrium(seed):
+    rng = random.Random(seed)
+    for _ in range(50):
+        scored, out = random_ball(rng)
+        value, bat, bowl = solve_ball(scored, out)
+        assert sum(bat) == pytest.approx(1.0)
+        assert sum(bowl) == pytest.approx(1.0)
+        assert min(bat) >= 0.0 and min(bowl) >= 0.0
+        count = len(NUMBERS)
+        for j in range(count):
+            # The bat mix earns at least the value whatever is bowled
+            earned = sum(bat[i] * payoff(scored, out, i, j) for i in range(count))
+            assert earned >= value - TOLERANCE
+        for i in range(count):
+            # and the bowl mix holds every pure bat choice to the value
+            earned = sum(bowl[j] * payoff(scored, out, i, j) for j in range(count))
+            assert earned <= value + TOLERANCE
+
+
+def test_solve_ball_with_nothing_to_play_for():
+    value, bat, bowl = solve_ball([0.5] * len(NUMBERS), 0.5)
+    assert value == 0.5
+    assert bat == bowl == [1.0 / len(NUMBERS)] * len(NUMBERS)
+
+
+@pytest.fixture(scope="module")
+def table():
+    return EquilibriumTable(max_runs=40)
+
+
+def check_cdf(cdf):
+    assert len(cdf) == len(NUMBERS)
+    assert cdf[-1] == 1.0
+    assert all(0.0 <= a <= b for a, b in zip(cdf, cdf[1:]))
+
+
+def test_every_state_has_a_cdf(table):
+    size = table.max_runs + 1
+    entries = (MAX_WICKETS + 1) * (size + 1) * len(NUMBERS)
+    assert len(table.chase_bat) == len(table.chase_bowl) == entries
+    assert len(table.defend_bat) == len(table.defend_bowl) == entries
+    for wickets in range(MAX_WICKETS + 1):
+        for runs in (0, 1, size - 1, size, size + 1, 10 * size):
+            for cdf in table.strategies(1, runs, wickets):
+                check_cdf(cdf)
+        for target in (0, 5, size, 10 * size):
+            for runs in (0, target, target + 1, target + 7):
+                for cdf in table.strategies(2, runs, wickets, target):
+                    check_cdf(cdf)
+
+
+def test_table_edges(table):
+    assert table.value(2, 10, 0, 10) == 0.5
+    assert table.value(2, 11, 0, 10) == 1.0
+    assert table.value(2, 9, 0, 10) == 0.0
+    size = table.max_runs + 1
+    assert table.value(1, 10 * size, MAX_WICKETS) == table.value(1, size, MAX_WICKETS)
+
+
+def test_policy_plays_whole_matches(table):
+    rng = random.Random(1)
+    policy = EquilibriumPolicy(MatchRNG(2), table)
+    for _ in range(20):
+        result = simulate_match(policy, RandomPolicy(rng), rng=rng)
+        assert result.player1_wickets <= MAX_WICKETS
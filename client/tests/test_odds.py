@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from cricket_engine import MAX_WICKETS, MatchEngine, RandomPolicy, simulate_match
+from cricket_odds import WinProbability, default_table
+
+
+def test_chase_edges():
+    table = default_table()
+    assert table.chase(1, 0) == (0.0, 1.0)
+    assert table.chase(2, 0) == (0.0, 0.0)
+    for wickets in range(MAX_WICKETS + 1):
+        assert table.chase(0, wickets) == (1.0, 0.0)
+        assert table.chase(-5, wickets) == (1.0, 0.0)
+
+
+def test_probabilities_add_up_for_every_state():
+    table = WinProbability(max_runs=150)
+    for wickets in range(MAX_WICKETS + 1):
+        for runs in range(0, 152):
+            for win, tie in (table.chase(runs, wickets), table.defend(runs, wickets)):
+                assert 0.0 <= win <= 1.0
+                assert 0.0 <= tie <= 1.0
+                assert win + tie <= 1.0 + 1e-12
+
+
+def test_non_uniform_distribution():
+    # Always batting 6 against a uniform bowler: every ball is a six or a wicket
+    table = WinProbability(bat_probs=[0, 0, 0, 0, 0, 1])
+    assert table.p_out == pytest.approx(1 / 6)
+    assert table.chase(6, 1) == pytest.approx((5 / 6, 0.0))
+    assert table.chase(12, 1) == pytest.approx(((5 / 6) ** 2, 0.0))
+    assert table.chase(7, 1) == pytest.approx(((5 / 6) ** 2, 5 / 6 * 1 / 6))
+    with pytest.raises(ValueError):
+        WinProbability(bat_probs=[1, 1, 1])
+    with pytest.raises(ValueError):
+        WinProbability(bat_probs=[1, 0, 0, 0, 0, 0], bowl_probs=[0, 1, 0, 0, 0, 0])
+
+
+def test_for_engine_sums_to_one():
+    engine = MatchEngine()
+    engine.start("player1")
+    rng = random.Random(2)
+    while not engine.finished:
+        p1, p2, tie = default_table().for_engine(engine)
+        assert p1 + p2 + tie == pytest.approx(1.0)
+        engine.play_ball(rng.randint(1, 6), rng.randint(1, 6))
+        if engine.should_end_innings():
+            engine.end_innings()
+
+
+def test_agrees_with_simulated_matches():
+    win, tie = default_table().defend(0, MAX_WICKETS)
+    rng = random.Random(3)
+    policy = RandomPolicy(rng)
+    results = [simulate_match(policy, policy, batting_first="player1", rng=rng) for _ in range(4000)]
+    wins = sum(r.winner == "player1" for r in results) / len(results)
+    ties = sum(r.winner is None for r in results) / len(results)
+    assert wins == pytest.approx(win, abs=0.03)
+    assert 0.002 < tie < 0.008
+    assert ties == pytest.approx(tie, abs=0.004)
@@ -0,0 +1,63 @@
+import random
+
+import pytest
+
+from cricket_engine import MatchEngine, MatchListener, RandomPolicy, simulate_match
+from cricket_replay import Replay, ReplayRecorder
+
+
+def record(seed, interval=16):
+    """Play a match; returns its Replay and the snapshot after every ball"""
+    recorder = ReplayRecorder(interval)
+    moves = []
+
+    class Moves(MatchListener):
+        def on_ball(self, engine, result):
+            moves.append((result.bat, result.bowl))
+
+    rng = random.Random(seed)
+    simulate_match(RandomPolicy(rng), RandomPolicy(rng), rng=rng, match_id=seed,
+                   listeners=[recorder, Moves()])
+
+    engine = MatchEngine()
+    engine.start(recorder.replay.tail.batting_first, seed)
+    states = [engine.snapshot()]
+    for bat, bowl in moves:
+        engine.play_ball(bat, bowl)
+        if not engine.finished and engine.should_end_innings():
+            engine.end_innings()
+        states.append(engine.snapshot())
+    return recorder.replay, states
+
+
+@pytest.mark.parametrize("interval", [1, 5, 16])
+def test_seek_reaches_every_recorded_position(interval):
+    replay, states = record(11, interval)
+    assert replay.last_ball == len(states) - 1
+    for ball in [0, len(states) - 1] + random.Random(1).sample(range(len(states)), 20):
+        assert replay.seek(ball) == states[ball]
+    assert MatchEngine.from_snapshot(replay.seek(replay.last_ball)).finished
+
+
+def test_seek_clamps_out_of_range_balls():
+    replay, states = record(12)
+    assert replay.seek(-5) == states[0]
+    assert replay.seek(10 ** 6) == states[-1]
+
+
+def test_save_and_load_round_trip(tmp_path):
+    replay, states = record(13)
+    path = str(tmp_path / "13.rpl")
+    replay.save(path)
+    loaded = Replay.load(path)
+    assert loaded.last_ball == replay.last_ball
+    assert loaded.moves == replay.moves
+    assert [loaded.seek(ball) for ball in range(len(states))] == states
+    assert loaded.tail.snapshot() == states[-1]
+
+
+def test_load_refuses_other_files(tmp_path):
+    path = tmp_path / "bad.rpl"
+    path.write_bytes(b"not a replay")
+    with pytest.raises(ValueError):
+        Replay.load(str(path))
@@ -0,0 +1,146 @@
+import asyncio
+import json
+import random
+import socket
+import threading
+import time
+
+from cricket_engine import RandomPolicy
+from cricket_server import MatchClient, MatchServer, encode, run_bot, serve
+
+
+async def start_server():
+    match_server = MatchServer(random.Random(1))
+    server = await serve("127.0.0.1", 0, match_server)
+    return match_server, server, server.sockets[0].getsockname()[1]
+
+
+async def stop_server(server):
+    # Let handlers see their clients go before the loop shuts down
+    await asyncio.sleep(0.05)
+    server.close()
+    await server.wait_closed()
+
+
+async def connect(port):
+    return await asyncio.open_connection("127.0.0.1", port)
+
+
+async def receive(reader):
+    return json.loads(await asyncio.wait_for(reader.readline(), 5))
+
+
+def wait_for(client, kind, timeout=5):
+    """Poll a MatchClient until a message of this type arrives"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if any(message["type"] == kind for message in client.poll()):
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_bots_play_whole_matches_over_localhost():
+    async def main():
+        match_server, server, port = await start_server()
+        winners = await asyncio.gather(*(
+            run_bot("127.0.0.1", port, RandomPolicy(random.Random(n)), team, room=f"room{n // 2}")
+            for n, team in enumerate(["India", "England"] * 4)))
+        await stop_server(server)
+        return match_server, winners
+
+    match_server, winners = asyncio.run(main())
+    # Both players of each room see the same result
+    assert winners[0::2] == winners[1::2]
+    assert all(winner in ("player1", "player2", None) for winner in winners)
+    assert match_server.waiting == {}
+
+
+def test_bad_messages_get_error_replies():
+    async def main():
+        _, server, port = await start_server()
+        reader, writer = await connect(port)
+        replies = []
+        for line in [b"not json\n", b"[1, 2]\n", b"5\n", b'{"type": "move", "number": 3}\n',
+                     b'{"type": "join", "team": "Atlantis"}\n']:
+            writer.write(line)
+            replies.append(await receive(reader))
+        writer.close()
+        await stop_server(server)
+        return replies
+
+    replies = asyncio.run(main())
+    assert [reply["type"] for reply in replies] == ["error"] * 5
+    assert replies[1]["message"] == replies[2]["message"] == "expected a JSON object"
+
+
+def test_moves_must_be_integers_from_one_to_six():
+    async def main():
+        _, server, port = await start_server()
+        (reader1, writer1), (reader2, writer2) = await connect(port), await connect(port)
+        writer1.write(encode({"type": "join", "team": "India"}))
+        assert (await receive(reader1))["type"] == "waiting"
+        writer2.write(encode({"type": "join", "team": "England"}))
+        start = await receive(reader1)
+        await receive(reader2)
+
+        replies = []
+        for number in [True, 7, "3", 2.0]:
+            writer1.write(encode({"type": "move", "number": number}))
+            replies.append(await receive(reader1))
+        writer1.write(encode({"type": "move", "number": 3}))
+        writer2.write(encode({"type": "move", "number": 4}))
+        ball = await receive(reader1)
+        writer2.close()
+        left = await receive(reader1)
+        writer1.close()
+        await stop_server(server)
+        return start, replies, ball, left
+
+    start, replies, ball, left = asyncio.run(main())
+    assert start["type"] == "start" and start["player2_team"] == "England"
+    assert [reply["message"] for reply in replies] == ["number must be 1-6"] * 4
+    assert ball["type"] == "ball" and {ball["bat"], ball["bowl"]} == {3, 4}
+    assert left["type"] == "opponent_left"
+
+
+def test_match_client_connects_in_the_background():
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+    state = {}
+
+    def run_server():
+        asyncio.set_event_loop(loop)
+        state["server"] = loop.run_until_complete(serve("127.0.0.1", 0, MatchServer(random.Random(2))))
+        state["port"] = state["server"].sockets[0].getsockname()[1]
+        ready.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=run_server, daemon=True)
+    thread.start()
+    ready.wait(5)
+    try:
+        client = MatchClient("127.0.0.1", state["port"])
+        assert wait_for(client, "connected")
+        client.join("Tester", "India")
+        assert wait_for(client, "waiting")
+        client.close()
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(5)
+        state["server"].close()
+        loop.run_until_complete(state["server"].wait_closed())
+        loop.close()
+
+
+def test_match_client_reports_a_failed_connection():
+    # Find a port with nothing listening on it
+    probe = socket.socket()
+    probe.bind(("127.0.0.1", 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    start = time.perf_counter()
+    client = MatchClient("127.0.0.1", port)
+    assert time.perf_counter() - start < 0.5
+    assert wait_for(client, "connect_failed")
+
@@ -0,0 +1,73 @@
+import random
+import struct
+
+import pytest
+
+from cricket_engine import SNAPSHOT, MatchEngine, MatchListener, RandomPolicy, simulate_match
+
+
+class Starts(MatchListener):
+    def __init__(self):
+        self.count = 0
+
+    def on_match_start(self, engine):
+        self.count += 1
+
+
+class Snapshots(MatchListener):
+    def __init__(self):
+        self.snapshots = []
+
+    def on_ball(self, engine, result):
+        self.snapshots.append((engine.snapshot(), engine.result()))
+
+
+def test_snapshot_round_trips_at_every_ball():
+    recorder = Snapshots()
+    simulate_match(RandomPolicy(random.Random(3)), RandomPolicy(random.Random(4)),
+                   rng=random.Random(5), match_id=2 ** 40 + 7, listeners=[recorder])
+    engine = MatchEngine()
+    for data, result in recorder.snapshots:
+        assert len(data) == SNAPSHOT.size
+        engine.restore(data)
+        assert engine.result() == result
+        assert engine.match_id == 2 ** 40 + 7
+        assert engine.snapshot() == data
+
+
+def test_finished_flags_survive_a_round_trip():
+    engine = MatchEngine("player2", match_id=9)
+    engine.start("player2", 9)
+    engine.abandon()
+    copy = MatchEngine.from_snapshot(engine.snapshot())
+    assert (copy.batting_first, copy.started, copy.finished, copy.abandoned) == ("player2", True, True, True)
+
+
+def test_restore_rejects_bad_snapshots():
+    engine = MatchEngine()
+    with pytest.raises(struct.error):
+        engine.restore(b"\0" * 10)
+    data = bytearray(MatchEngine().snapshot())
+    data[0] = 99
+    with pytest.raises(ValueError):
+        engine.restore(bytes(data))
+
+
+def test_resume_only_announces_live_matches():
+    live = MatchEngine()
+    live.start("player1", 1)
+    live.play_ball(4, 1)
+    done = MatchEngine()
+    done.start("player1", 2)
+    done.abandon()
+
+    starts = Starts()
+    engine = MatchEngine()
+    engine.listeners.append(starts)
+    engine.restore(live.snapshot())
+    assert starts.count == 0
+    engine.resume(live.snapshot())
+    assert starts.count == 1
+    assert engine.player1_score == 4
+    engine.resume(done.snapshot())
+    assert starts.count == 1
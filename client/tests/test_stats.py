@@ -0,0 +1,54 @@
+import random
+
+from cricket_engine import RandomPolicy, simulate_match
+from cricket_rosters import default_rosters
+from cricket_stats import CareerStats, TopK
+
+
+def fill(stats, count, seed=1):
+    rng = random.Random(seed)
+    rosters = default_rosters()
+    teams = list(rosters)
+    for match_id in range(count):
+        team1, team2 = rng.sample(teams, 2)
+        stats.add_match(match_id, team1, team2,
+                        simulate_match(RandomPolicy(rng), RandomPolicy(rng), rng=rng), rosters)
+
+
+def test_topk_keeps_the_largest_values():
+    top = TopK(3)
+    values = {}
+    rng = random.Random(2)
+    for _ in range(500):
+        key = rng.randrange(40)
+        values[key] = values.get(key, 0) + rng.randrange(10)
+        top.update(key, values[key])
+    expected = sorted(values.items(), key=lambda item: (-item[1], item[0]))[:3]
+    assert top.items() == expected
+
+
+def test_team_leaderboard_ranks_wins_then_fewest_losses():
+    stats = CareerStats(k=10)
+    fill(stats, 300)
+    expected = sorted(((team, *record) for team, record in stats.teams.items()),
+                      key=lambda row: (-row[1], row[2], row[0]))
+    assert stats.team_leaderboard() == expected
+
+
+def test_totals_and_boards_survive_save_and_load(tmp_path):
+    path = str(tmp_path / "stats.json")
+    stats = CareerStats(path, k=5)
+    fill(stats, 100)
+    stats.save()
+    loaded = CareerStats(path, k=5)
+    assert loaded.matches == 100
+    assert loaded.players == stats.players
+    assert loaded.teams == stats.teams
+    assert loaded.leaderboard() == stats.leaderboard()
+    assert loaded.best_innings() == stats.best_innings()
+    assert loaded.team_leaderboard() == stats.team_leaderboard()
+
+    fill(stats, 20, seed=3)
+    fill(loaded, 20, seed=3)
+    assert loaded.leaderboard() == stats.leaderboard()
+    assert loaded.team_leaderboard() == stats.team_leaderboard()
@@ -1,5 +1,6 @@
 import express from 'express';
 import dotenv from 'dotenv';
+import net from 'node:net';
 import { setupStaticServing } from './static-serve.js';
 
 dotenv.config();
@@ -15,6 +16,53 @@ app.use(express.urlencoded({ extended: true }));
 //   res.json({ message: 'Hello World!' });
 // });
 
+// Live scores from the cricket match server's spectator feed (cricket_broadcast.py)
+const SPECTATOR_HOST = process.env.SPECTATOR_HOST || '127.0.0.1';
+const SPECTATOR_PORT = Number(process.env.SPECTATOR_PORT || 8766);
+
+// Send one request line to the spectator feed and hand back each JSON line it returns
+function openFeed(request: object, onLine: (line: string) => void, onClose: () => void) {
+  const socket = net.connect(SPECTATOR_PORT, SPECTATOR_HOST, () => {
+    socket.write(JSON.stringify(request) + '\n');
+  });
+  let pending = '';
+  socket.setEncoding('utf8');
+  socket.on('data', (chunk: string) => {
+    const lines = (pending + chunk).split('\n');
+    pending = lines.pop() ?? '';
+    lines.forEach((line) => line && onLine(line));
+  });
+  socket.on('error', () => socket.destroy());
+  socket.on('close', onClose);
+  return socket;
+}
+
+app.get('/api/matches/live', (req: express.Request, res: express.Response) => {
+  let answered = false;
+  openFeed({ type: 'list' }, (line) => {
+    answered = true;
+    res.type('application/json').send(line);
+  }, () => {
+    if (!answered) {
+      res.status(502).json({ error: 'spectator feed unavailable' });
+    }
+  });
+});
+
+// Server-sent events: one "sync" with the full scoreboard, then ball/innings/end deltas
+app.get('/api/matches/:id/live', (req: express.Request, res: express.Response) => {
+  res.set({
+    'Content-Type': 'text/event-stream',
+    'Cache-Control': 'no-cache',
+    Connection: 'keep-alive',
+  });
+  res.flushHeaders();
+  const socket = openFeed({ type: 'watch', match_id: Number(req.params.id) },
+    (line) => res.write(`data: ${line}\n\n`),
+    () => res.end());
+  req.on('close', () => socket.destroy());
+});
+
 // Export a function to start the server
 export async function startServer(port) {
   try {